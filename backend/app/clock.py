@@ -0,0 +1,27 @@
+"""
+Coarse wall-clock timestamps shared by the API and gRPC servers
+"""
+
+import time
+from datetime import datetime
+
+class CoarseClock:
+    """ISO wall-clock string, reformatted at most once per `resolution` seconds"""
+    
+    __slots__ = ("_resolution", "_next_refresh", "_iso")
+    
+    def __init__(self, resolution: float = 0.001):
+        self._resolution = resolution
+        self._next_refresh = 0.0
+        self._iso = ""
+    
+    def now_iso(self) -> str:
+        # Refreshed lazily on read; a ticker thread would wake every millisecond
+        # and compete with the event loop for the GIL even when idle
+        mono = time.monotonic()
+        if mono >= self._next_refresh:
+            # The string is published before the deadline, so a concurrent
+            # reader that skips the refresh never sees an older value
+            self._iso = datetime.now().isoformat()
+            self._next_refresh = mono + self._resolution
+        return self._iso
@@ -3,15 +3,24 @@ EHR Data Generator using Faker library for realistic medical records.
 Focuses on diabetes/hypertension use case for clinical trial matching.
 """
 
-from faker import Faker
-from faker.providers import BaseProvider
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple, Iterator
+from datetime import date, datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+import multiprocessing
+import os
 import random
-from dataclasses import dataclass
+import zlib
+import numpy as np
+from dataclasses import dataclass, field, fields
 from enum import Enum
 
-fake = Faker()
+@lru_cache(maxsize=1)
+def _faker_class():
+    """Import Faker on first use; loading its providers is the slow part of importing this module"""
+    from faker import Faker
+    return Faker
 
 class ProcessingState(Enum):
     PROCESSING_STATE_UNSPECIFIED = 0
@@ -25,72 +34,86 @@ class FHIRVersion(Enum):
     FHIR_VERSION_R4 = 1
     FHIR_VERSION_R4B = 2
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PatientArchetype:
     age_range: tuple[int, int]
     sex: str
-    diagnoses: List[Dict[str, str]]
-    medications: List[str]
+    diagnoses: tuple[tuple[str, str, str], ...]  # (code, text, since)
+    medications: tuple[str, ...]
     a1c_range: tuple[float, float]
-    condition_focus: List[str]
+    condition_focus: tuple[str, ...]
+    _diag_records: tuple[Dict[str, str], ...] = field(init=False, repr=False, compare=False)
+    _diag_text: str = field(init=False, repr=False, compare=False)
+    _med_text: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Frozen, so derived fields go through object.__setattr__: the diagnosis
+        # record templates copied into derived facts, plus the lines used by clinical notes
+        object.__setattr__(self, "_diag_records", tuple(
+            {"code": code, "text": text, "since": since} for code, text, since in self.diagnoses
+        ))
+        object.__setattr__(self, "_diag_text", ', '.join(d[1] for d in self.diagnoses))
+        object.__setattr__(self, "_med_text", ', '.join(
+            f"{med} {'1000mg BID' if med == 'metformin' else '10mg daily'}" for med in self.medications
+        ))
 
 # Patient archetypes for diabetes/hypertension
 PATIENT_ARCHETYPES = [
     PatientArchetype(
         age_range=(45, 65),
         sex="female",
-        diagnoses=[
-            {"code": "E11.9", "text": "Type 2 Diabetes without complications", "since": "2017"},
-            {"code": "I10", "text": "Essential Hypertension", "since": "2019"}
-        ],
-        medications=["metformin", "lisinopril"],
+        diagnoses=(
+            ("E11.9", "Type 2 Diabetes without complications", "2017"),
+            ("I10", "Essential Hypertension", "2019")
+        ),
+        medications=("metformin", "lisinopril"),
         a1c_range=(7.8, 9.2),
-        condition_focus=["type 2 diabetes", "hypertension"]
+        condition_focus=("type 2 diabetes", "hypertension")
     ),
     PatientArchetype(
         age_range=(50, 70),
         sex="male",
-        diagnoses=[
-            {"code": "E11.9", "text": "Type 2 Diabetes without complications", "since": "2015"},
-            {"code": "I10", "text": "Essential Hypertension", "since": "2018"},
-            {"code": "E78.5", "text": "Hyperlipidemia", "since": "2020"}
-        ],
-        medications=["metformin", "amlodipine", "atorvastatin"],
+        diagnoses=(
+            ("E11.9", "Type 2 Diabetes without complications", "2015"),
+            ("I10", "Essential Hypertension", "2018"),
+            ("E78.5", "Hyperlipidemia", "2020")
+        ),
+        medications=("metformin", "amlodipine", "atorvastatin"),
         a1c_range=(8.0, 10.1),
-        condition_focus=["type 2 diabetes", "cardiovascular disease"]
+        condition_focus=("type 2 diabetes", "cardiovascular disease")
     ),
     PatientArchetype(
         age_range=(40, 60),
         sex="female",
-        diagnoses=[
-            {"code": "E11.9", "text": "Type 2 Diabetes without complications", "since": "2020"}
-        ],
-        medications=["metformin", "glipizide"],
+        diagnoses=(
+            ("E11.9", "Type 2 Diabetes without complications", "2020"),
+        ),
+        medications=("metformin", "glipizide"),
         a1c_range=(7.2, 8.5),
-        condition_focus=["type 2 diabetes"]
+        condition_focus=("type 2 diabetes",)
     ),
     PatientArchetype(
         age_range=(55, 75),
         sex="male",
-        diagnoses=[
-            {"code": "E11.9", "text": "Type 2 Diabetes without complications", "since": "2014"},
-            {"code": "I10", "text": "Essential Hypertension", "since": "2016"},
-            {"code": "N18.3", "text": "Chronic kidney disease stage 3", "since": "2021"}
-        ],
-        medications=["metformin", "losartan", "furosemide"],
+        diagnoses=(
+            ("E11.9", "Type 2 Diabetes without complications", "2014"),
+            ("I10", "Essential Hypertension", "2016"),
+            ("N18.3", "Chronic kidney disease stage 3", "2021")
+        ),
+        medications=("metformin", "losartan", "furosemide"),
         a1c_range=(8.5, 10.8),
-        condition_focus=["type 2 diabetes", "chronic kidney disease"]
+        condition_focus=("type 2 diabetes", "chronic kidney disease")
     ),
     PatientArchetype(
         age_range=(35, 55),
         sex="female",
-        diagnoses=[
-            {"code": "E11.9", "text": "Type 2 Diabetes without complications", "since": "2019"},
-            {"code": "E66.9", "text": "Obesity, unspecified", "since": "2018"}
-        ],
-        medications=["metformin", "semaglutide"],
+        diagnoses=(
+            ("E11.9", "Type 2 Diabetes without complications", "2019"),
+            ("E66.9", "Obesity, unspecified", "2018")
+        ),
+        medications=("metformin", "semaglutide"),
         a1c_range=(6.8, 8.0),
-        condition_focus=["type 2 diabetes", "obesity", "weight management"]
+        condition_focus=("type 2 diabetes", "obesity", "weight management")
     )
 ]
 
@@ -104,63 +127,66 @@ RESOURCE_TYPES = [
     "ReferralNote"
 ]
 
-class EHRDataGenerator:
-    def __init__(self):
-        self.fake = Faker()
-        self.patients = []
-        self.resources = []
-        self.derived_facts = []
-        
-        # Mid-tier American cities that make sense for a diabetes/hypertension clinic
-        self.mid_tier_cities = [
-            "Springfield, IL", "Madison, WI", "Fort Wayne, IN", "Grand Rapids, MI",
-            "Chattanooga, TN", "Spokane, WA", "Boise, ID", "Reno, NV",
-            "Lansing, MI", "Peoria, IL", "Cedar Rapids, IA", "Green Bay, WI",
-            "Evansville, IN", "Dayton, OH", "Rockford, IL", "Springfield, MO",
-            "Fargo, ND", "Sioux Falls, SD", "Burlington, VT", "Manchester, NH"
-        ]
-    
-    def generate_patients(self, num_patients: int) -> List[Dict[str, Any]]:
-        """Generate patient profiles using archetypes"""
-        patients = []
-        
-        for i in range(num_patients):
-            archetype = self.fake.random_element(PATIENT_ARCHETYPES)
-            patient = {
-                "id": f"P{(i + 1):03d}",
-                "name": self.fake.name(),
-                "email": self.fake.email(),
-                "consent_given": True,
-                "preferences": {
-                    "preferred_location": self.fake.random_element(self.mid_tier_cities),
-                    "willing_to_travel": self.fake.boolean(),
-                    "condition_focus": archetype.condition_focus,
-                    "trial_phase_preference": self.fake.random_sample(
-                        ["Phase I", "Phase II", "Phase III"], length=self.fake.random_int(1, 2)
-                    ),
-                    "trial_type": self.fake.random_sample(
-                        ["drug", "observational", "behavioral"], length=self.fake.random_int(1, 2)
-                    )
-                },
-                "created_at": self.fake.date_time_between(start_date="-1y").isoformat(),
-                "_archetype": archetype  # Internal use
-            }
-            patients.append(patient)
-        
-        self.patients = patients
-        return patients
+AI_SUMMARIES = {
+    "LabReport": [
+        "Poor glycemic control indicated by elevated A1C; lipid management needed.",
+        "Diabetes well-controlled; renal function stable for continued metformin use.",
+        "Suboptimal glucose control; consider medication intensification."
+    ],
+    "ClinicalNote": [
+        "Diabetes and hypertension with elevated BP; lifestyle counseling reinforced.",
+        "Stable chronic conditions; medication adherence good; routine follow-up planned.",
+        "Multiple comorbidities requiring ongoing management and monitoring."
+    ],
+    "DischargeSummary": [
+        "Hypoglycemia episode resolved; patient education provided on prevention.",
+        "Brief hospitalization for diabetes-related complication; stable at discharge.",
+        "Routine discharge after successful management of acute episode."
+    ],
+    "MedicationList": [
+        "Standard diabetes and hypertension regimen; adherence generally acceptable.",
+        "Current medications appropriate for comorbidities; no immediate changes needed.",
+        "Multi-drug regimen for diabetes management; monitoring for drug interactions."
+    ]
+}
+_DEFAULT_AI_SUMMARY = "Standard clinical documentation reviewed."
+
+# Plain int enum values for the resource loop (avoids Enum .value lookups)
+_STATE_COMPLETED = ProcessingState.PROCESSING_STATE_COMPLETED.value
+_STATE_PROCESSING = ProcessingState.PROCESSING_STATE_PROCESSING.value
+_STATE_FAILED = ProcessingState.PROCESSING_STATE_FAILED.value
+_STATE_NOT_STARTED = ProcessingState.PROCESSING_STATE_NOT_STARTED.value
+_FHIR_VERSIONS = (FHIRVersion.FHIR_VERSION_R4.value, FHIRVersion.FHIR_VERSION_R4B.value)
+
+# Weighted processing-state distribution for generated resources
+_STATES = [_STATE_COMPLETED, _STATE_PROCESSING, _STATE_FAILED, _STATE_NOT_STARTED]
+_STATE_WEIGHTS = [0.7, 0.15, 0.1, 0.05]
+
+_EXCLUSIONS = ["pregnancy", "type1_diabetes", "severe_renal_disease"]
+
+def _draw_facts(
+    np_rng: np.random.Generator,
+    n: int,
+    age_range: tuple[int, int],
+    a1c_range: tuple[float, float]
+) -> np.ndarray:
+    """Draw (age, a1c, egfr, ldl, sbp, dbp, exclusion_idx) rows for n patients.
     
-    def generate_lab_report(self, patient_id: str, archetype: PatientArchetype) -> str:
-        """Generate realistic lab report content"""
-        a1c = round(self.fake.random.uniform(*archetype.a1c_range), 1)
-        glucose = self.fake.random_int(140, 220)
-        creatinine = round(self.fake.random.uniform(0.8, 1.2), 1)
-        egfr = self.fake.random_int(75, 105)
-        ldl = self.fake.random_int(100, 150)
-        hdl = self.fake.random_int(40, 60) if archetype.sex == "female" else self.fake.random_int(35, 55)
-        triglycerides = self.fake.random_int(150, 220)
-        
-        return f"""Laboratory Results - {self.fake.date_between(start_date='-30d').strftime('%m/%d/%Y')}
+    exclusion_idx is -1 when the patient has no exclusion.
+    """
+    draws = np.empty((n, 7))
+    draws[:, 0] = np_rng.integers(age_range[0], age_range[1], size=n, endpoint=True)
+    draws[:, 1] = np.round(np_rng.uniform(a1c_range[0], a1c_range[1], size=n), 1)
+    draws[:, 2] = np_rng.integers(75, 105, size=n, endpoint=True)
+    draws[:, 3] = np_rng.integers(100, 150, size=n, endpoint=True)
+    draws[:, 4] = np_rng.integers(135, 155, size=n, endpoint=True)
+    draws[:, 5] = np_rng.integers(85, 95, size=n, endpoint=True)
+    has_exclusion = np_rng.integers(0, 1, size=n, endpoint=True).astype(bool)
+    draws[:, 6] = np.where(has_exclusion, np_rng.integers(0, len(_EXCLUSIONS), size=n), -1)
+    return draws
+
+# Document templates, bound to str.format once at import
+_LAB_TEMPLATE = """Laboratory Results - {date}
         
 Hemoglobin A1C: {a1c}% (ref <5.7%)
 Fasting Glucose: {glucose} mg/dL (ref 70-99 mg/dL)
@@ -170,22 +196,13 @@ Lipid Panel:
   - LDL Cholesterol: {ldl} mg/dL
   - HDL Cholesterol: {hdl} mg/dL  
   - Triglycerides: {triglycerides} mg/dL
-Microalbumin/Creatinine Ratio: {round(self.fake.random.uniform(15, 45), 1)} mg/g"""
-    
-    def generate_clinical_note(self, patient_id: str, archetype: PatientArchetype) -> str:
-        """Generate clinical visit note"""
-        age = self.fake.random_int(*archetype.age_range)
-        weight = self.fake.random_int(70, 95)
-        bmi = round(self.fake.random.uniform(28, 35), 1)
-        sbp = self.fake.random_int(135, 155)
-        dbp = self.fake.random_int(85, 95)
-        a1c = round(self.fake.random.uniform(*archetype.a1c_range), 1)
-        
-        return f"""Clinical Visit Note - {self.fake.date_between(start_date='-60d').strftime('%m/%d/%Y')}
+Microalbumin/Creatinine Ratio: {microalbumin} mg/g""".format
 
-{age}-year-old {archetype.sex} with history of {', '.join([d['text'] for d in archetype.diagnoses])}.
+_CLINICAL_NOTE_TEMPLATE = """Clinical Visit Note - {date}
 
-Current medications: {', '.join([f"{med} {'1000mg BID' if med == 'metformin' else '10mg daily'}" for med in archetype.medications])}.
+{age}-year-old {sex} with history of {diagnoses}.
+
+Current medications: {medications}.
 
 Vital Signs:
 - Blood Pressure: {sbp}/{dbp} mmHg
@@ -200,20 +217,9 @@ Plan:
 - Reinforce dietary counseling and exercise recommendations  
 - Consider medication adjustment if A1C remains >8% at next visit
 - Recheck labs in 12 weeks
-- Ophthalmology referral for diabetic retinal screening"""
-    
-    def generate_discharge_summary(self, patient_id: str, archetype: PatientArchetype) -> str:
-        """Generate hospital discharge summary"""
-        admission_reasons = [
-            "hypoglycemia episode",
-            "diabetic ketoacidosis", 
-            "hypertensive urgency",
-            "chest pain evaluation"
-        ]
-        reason = self.fake.random_element(admission_reasons)
-        glucose = self.fake.random_int(55, 75)
-        
-        return f"""Hospital Discharge Summary - {self.fake.date_between(start_date='-90d').strftime('%m/%d/%Y')}
+- Ophthalmology referral for diabetic retinal screening""".format
+
+_DISCHARGE_TEMPLATE = """Hospital Discharge Summary - {date}
 
 Admission Diagnosis: {reason}
 Discharge Diagnosis: {reason}, resolved
@@ -222,13 +228,241 @@ Hospital Course:
 Patient presented to ED with {reason}. Glucose level was {glucose} mg/dL on arrival.
 Treated with oral glucose and IV dextrose with good response. Blood sugar normalized within 2 hours.
 
-Medications at Discharge: {', '.join(archetype.medications)} - no changes made
+Medications at Discharge: {medications} - no changes made
 
 Discharge Instructions:
 - Follow up with primary care provider in 1-2 weeks
 - Continue current medications as prescribed
 - Blood glucose monitoring 2x daily
-- Return to ED if symptoms recur"""
+- Return to ED if symptoms recur""".format
+
+_MEDICATION_LIST_TEMPLATE = """Current Medication List - Updated {date}
+
+Active Medications:
+{medications}
+
+Allergies: NKDA (No Known Drug Allergies)
+
+Adherence: Patient reports good adherence, occasionally misses evening doses
+Last pharmacy refill: {refill_date}""".format
+
+_NL = "\n"
+
+def _us_date(d: date) -> str:
+    """Format a date as MM/DD/YYYY without going through strftime"""
+    return f"{d.month:02d}/{d.day:02d}/{d.year}"
+
+# Below this many patients the process pool costs more to start than it saves
+PARALLEL_MIN_PATIENTS = 200
+
+@dataclass
+class ResourceColumns:
+    """Generated resources stored column-wise; storage layers build their own records from rows()"""
+    state: List[int] = field(default_factory=list)
+    created_time: List[str] = field(default_factory=list)
+    fetch_time: List[str] = field(default_factory=list)
+    processed_time: List[Optional[str]] = field(default_factory=list)
+    key: List[str] = field(default_factory=list)
+    uid: List[str] = field(default_factory=list)
+    patient_id: List[str] = field(default_factory=list)
+    resource_type: List[str] = field(default_factory=list)
+    version: List[int] = field(default_factory=list)
+    human_readable_str: List[str] = field(default_factory=list)
+    ai_summary: List[Optional[str]] = field(default_factory=list)
+    
+    def __len__(self) -> int:
+        return len(self.state)
+    
+    def append(
+        self,
+        state: int,
+        created_time: str,
+        fetch_time: str,
+        processed_time: Optional[str],
+        key: str,
+        uid: str,
+        patient_id: str,
+        resource_type: str,
+        version: int,
+        human_readable_str: str,
+        ai_summary: Optional[str]
+    ) -> None:
+        self.state.append(state)
+        self.created_time.append(created_time)
+        self.fetch_time.append(fetch_time)
+        self.processed_time.append(processed_time)
+        self.key.append(key)
+        self.uid.append(uid)
+        self.patient_id.append(patient_id)
+        self.resource_type.append(resource_type)
+        self.version.append(version)
+        self.human_readable_str.append(human_readable_str)
+        self.ai_summary.append(ai_summary)
+    
+    def extend(self, other: "ResourceColumns") -> None:
+        for f in fields(self):
+            getattr(self, f.name).extend(getattr(other, f.name))
+    
+    def rows(self) -> Iterator[Tuple[Any, ...]]:
+        """Yield one tuple of resource fields per resource, in append() argument order"""
+        return zip(
+            self.state, self.created_time, self.fetch_time, self.processed_time,
+            self.key, self.uid, self.patient_id, self.resource_type, self.version,
+            self.human_readable_str, self.ai_summary
+        )
+
+class EHRDataGenerator:
+    def __init__(self):
+        # Faker is built on first access to self.fake
+        self._fake = None
+        self._fake_seed: Optional[int] = None
+        # Plain RNG for numeric draws; skips Faker's provider dispatch
+        self._rng = random.Random()
+        self._np_rng = np.random.default_rng()
+        self.patients = []
+        self.resources = ResourceColumns()
+        self.derived_facts = []
+        
+        # Mid-tier American cities that make sense for a diabetes/hypertension clinic
+        self.mid_tier_cities = [
+            "Springfield, IL", "Madison, WI", "Fort Wayne, IN", "Grand Rapids, MI",
+            "Chattanooga, TN", "Spokane, WA", "Boise, ID", "Reno, NV",
+            "Lansing, MI", "Peoria, IL", "Cedar Rapids, IA", "Green Bay, WI",
+            "Evansville, IN", "Dayton, OH", "Rockford, IL", "Springfield, MO",
+            "Fargo, ND", "Sioux Falls, SD", "Burlington, VT", "Manchester, NH"
+        ]
+    
+    @property
+    def fake(self):
+        if self._fake is None:
+            self._fake = _faker_class()()
+            if self._fake_seed is not None:
+                self._fake.seed_instance(self._fake_seed)
+        return self._fake
+    
+    def seed(self, seed: int) -> None:
+        """Seed both the Faker instance and the numeric RNG"""
+        self._fake_seed = seed
+        if self._fake is not None:
+            self._fake.seed_instance(seed)
+        self._rng.seed(seed)
+        self._np_rng = np.random.default_rng(seed)
+    
+    def _recent_date(self, max_days_ago: int) -> date:
+        """Random date within the last `max_days_ago` days"""
+        return date.today() - timedelta(days=self._rng.randint(0, max_days_ago))
+    
+    def generate_patients(
+        self,
+        num_patients: int
+    ) -> Tuple[List[Dict[str, Any]], List[PatientArchetype]]:
+        """Generate patient profiles and the archetype each was drawn from (parallel lists)"""
+        # Draw the Faker-backed fields in batches ahead of the builder loop
+        archetypes = self._rng.choices(PATIENT_ARCHETYPES, k=num_patients)
+        names = [self.fake.name() for _ in range(num_patients)]
+        emails = [self.fake.email() for _ in range(num_patients)]
+        created_ats = [self.fake.date_time_between(start_date="-1y").isoformat() for _ in range(num_patients)]
+        
+        patients = [
+            self._build_patient(i, archetypes[i], names[i], emails[i], created_ats[i])
+            for i in range(num_patients)
+        ]
+        
+        self.patients = patients
+        return patients, archetypes
+    
+    def _build_patient(
+        self,
+        index: int,
+        archetype: PatientArchetype,
+        name: str,
+        email: str,
+        created_at: str
+    ) -> Dict[str, Any]:
+        """Build a single patient profile for the given archetype"""
+        rng = self._rng
+        return {
+            "id": f"P{(index + 1):03d}",
+            "name": name,
+            "email": email,
+            "consent_given": True,
+            "preferences": {
+                "preferred_location": rng.choice(self.mid_tier_cities),
+                "willing_to_travel": rng.random() < 0.5,
+                "condition_focus": list(archetype.condition_focus),
+                "trial_phase_preference": rng.sample(
+                    ["Phase I", "Phase II", "Phase III"], k=rng.randint(1, 2)
+                ),
+                "trial_type": rng.sample(
+                    ["drug", "observational", "behavioral"], k=rng.randint(1, 2)
+                )
+            },
+            "created_at": created_at
+        }
+    
+    def generate_lab_report(self, patient_id: str, archetype: PatientArchetype) -> str:
+        """Generate realistic lab report content"""
+        rng = self._rng
+        a1c = round(rng.uniform(*archetype.a1c_range), 1)
+        glucose = rng.randint(140, 220)
+        creatinine = round(rng.uniform(0.8, 1.2), 1)
+        egfr = rng.randint(75, 105)
+        ldl = rng.randint(100, 150)
+        hdl = rng.randint(40, 60) if archetype.sex == "female" else rng.randint(35, 55)
+        triglycerides = rng.randint(150, 220)
+        
+        return _LAB_TEMPLATE(
+            date=_us_date(self._recent_date(30)),
+            a1c=a1c,
+            glucose=glucose,
+            creatinine=creatinine,
+            egfr=egfr,
+            ldl=ldl,
+            hdl=hdl,
+            triglycerides=triglycerides,
+            microalbumin=round(rng.uniform(15, 45), 1)
+        )
+    
+    def generate_clinical_note(self, patient_id: str, archetype: PatientArchetype) -> str:
+        """Generate clinical visit note"""
+        rng = self._rng
+        age = rng.randint(*archetype.age_range)
+        weight = rng.randint(70, 95)
+        bmi = round(rng.uniform(28, 35), 1)
+        sbp = rng.randint(135, 155)
+        dbp = rng.randint(85, 95)
+        a1c = round(rng.uniform(*archetype.a1c_range), 1)
+        
+        return _CLINICAL_NOTE_TEMPLATE(
+            date=_us_date(self._recent_date(60)),
+            age=age,
+            sex=archetype.sex,
+            diagnoses=archetype._diag_text,
+            medications=archetype._med_text,
+            sbp=sbp,
+            dbp=dbp,
+            weight=weight,
+            bmi=bmi,
+            a1c=a1c
+        )
+    
+    def generate_discharge_summary(self, patient_id: str, archetype: PatientArchetype) -> str:
+        """Generate hospital discharge summary"""
+        admission_reasons = [
+            "hypoglycemia episode",
+            "diabetic ketoacidosis", 
+            "hypertensive urgency",
+            "chest pain evaluation"
+        ]
+        reason = self._rng.choice(admission_reasons)
+        glucose = self._rng.randint(55, 75)
+        
+        return _DISCHARGE_TEMPLATE(
+            date=_us_date(self._recent_date(90)),
+            reason=reason,
+            glucose=glucose,
+            medications=', '.join(archetype.medications)
+        )
     
     def generate_medication_list(self, patient_id: str, archetype: PatientArchetype) -> str:
         """Generate current medication list"""
@@ -236,71 +470,73 @@ Discharge Instructions:
         
         med_list = [
             "1. Metformin 1000 mg PO BID - for diabetes",
-            f"2. {archetype.medications[1]} {self.fake.random_element(med_doses)} PO daily - for hypertension"
+            f"2. {archetype.medications[1]} {self._rng.choice(med_doses)} PO daily - for hypertension"
         ]
         
         if len(archetype.medications) > 2:
             med_list.append(f"3. {archetype.medications[2]} 20 mg PO QHS - for hyperlipidemia")
         
-        return f"""Current Medication List - Updated {self.fake.date_between(start_date='-14d').strftime('%m/%d/%Y')}
-
-Active Medications:
-{chr(10).join(med_list)}
-
-Allergies: NKDA (No Known Drug Allergies)
-
-Adherence: Patient reports good adherence, occasionally misses evening doses
-Last pharmacy refill: {self.fake.date_between(start_date='-20d').strftime('%m/%d/%Y')}"""
+        return _MEDICATION_LIST_TEMPLATE(
+            date=_us_date(self._recent_date(14)),
+            medications=_NL.join(med_list),
+            refill_date=_us_date(self._recent_date(20))
+        )
     
     def generate_ai_summary(self, resource_type: str, content: str) -> str:
         """Generate AI summary based on resource type"""
-        summaries = {
-            "LabReport": [
-                "Poor glycemic control indicated by elevated A1C; lipid management needed.",
-                "Diabetes well-controlled; renal function stable for continued metformin use.",
-                "Suboptimal glucose control; consider medication intensification."
-            ],
-            "ClinicalNote": [
-                "Diabetes and hypertension with elevated BP; lifestyle counseling reinforced.",
-                "Stable chronic conditions; medication adherence good; routine follow-up planned.",
-                "Multiple comorbidities requiring ongoing management and monitoring."
-            ],
-            "DischargeSummary": [
-                "Hypoglycemia episode resolved; patient education provided on prevention.",
-                "Brief hospitalization for diabetes-related complication; stable at discharge.",
-                "Routine discharge after successful management of acute episode."
-            ],
-            "MedicationList": [
-                "Standard diabetes and hypertension regimen; adherence generally acceptable.",
-                "Current medications appropriate for comorbidities; no immediate changes needed.",
-                "Multi-drug regimen for diabetes management; monitoring for drug interactions."
-            ]
-        }
-        
-        return self.fake.random_element(summaries.get(resource_type, ["Standard clinical documentation reviewed."]))
+        return self._rng.choice(AI_SUMMARIES.get(resource_type, (_DEFAULT_AI_SUMMARY,)))
     
     def generate_ehr_resources(
         self, 
         patients: List[Dict[str, Any]], 
+        archetypes: List[PatientArchetype],
         min_resources: int = 3, 
         max_resources: int = 6
-    ) -> List[Dict[str, Any]]:
+    ) -> ResourceColumns:
         """Generate EHR resources for patients"""
-        resources = []
+        resources = ResourceColumns()
+        for row in self._iter_resource_rows(patients, archetypes, min_resources, max_resources):
+            resources.append(*row)
+        
+        self.resources = resources
+        return resources
+    
+    def _iter_resource_rows(
+        self,
+        patients: List[Dict[str, Any]],
+        archetypes: List[PatientArchetype],
+        min_resources: int,
+        max_resources: int
+    ) -> Iterator[Tuple[Any, ...]]:
+        """Yield one tuple of resource fields per generated resource, in ResourceColumns order"""
+        rng = self._rng
+        
+        # Draw every resource's timestamp offsets up front in three vectorized calls
+        counts = [rng.randint(min_resources, max_resources) for _ in patients]
+        total = sum(counts)
+        now = datetime.now()
+        created_offsets = self._np_rng.integers(0, 365 * 86400, size=total).tolist()
+        fetch_delays = self._np_rng.integers(1000, 10000, size=total, endpoint=True).tolist()
+        processing_delays = self._np_rng.integers(5000, 60000, size=total, endpoint=True).tolist()
+        n = 0
         
-        for patient in patients:
-            archetype = patient["_archetype"]
-            num_resources = self.fake.random_int(min_resources, max_resources)
+        # One choices() draw per resource type covers every summary this call can need
+        summary_pools = {
+            resource_type: iter(rng.choices(pool, k=total))
+            for resource_type, pool in AI_SUMMARIES.items()
+        }
+        
+        for patient, archetype, num_resources in zip(patients, archetypes, counts):
+            uid_base = zlib.crc32(patient["id"].encode()) % 10000
+            states = rng.choices(_STATES, weights=_STATE_WEIGHTS, k=num_resources)
             
             for i in range(num_resources):
-                resource_type = self.fake.random_element(RESOURCE_TYPES)
-                created_time = self.fake.date_time_between(start_date="-1y")
-                fetch_time = created_time + timedelta(
-                    milliseconds=self.fake.random_int(1000, 10000)
-                )
-                processing_time = fetch_time + timedelta(
-                    milliseconds=self.fake.random_int(5000, 60000)
-                )
+                state = states[i]
+                resource_type = rng.choice(RESOURCE_TYPES)
+                created_time = now - timedelta(seconds=created_offsets[n])
+                fetch_time = created_time + timedelta(milliseconds=fetch_delays[n])
+                processing_time = fetch_time + timedelta(milliseconds=processing_delays[n])
+                n += 1
                 
                 # Generate content based on resource type
                 if resource_type == "LabReport":
@@ -314,77 +550,62 @@ Last pharmacy refill: {self.fake.date_between(start_date='-20d').strftime('%m/%d
                 else:
                     content = f"{resource_type} document for patient {patient['id']}"
                 
-                # Weighted state selection
-                state_weights = [
-                    (ProcessingState.PROCESSING_STATE_COMPLETED, 0.7),
-                    (ProcessingState.PROCESSING_STATE_PROCESSING, 0.15),
-                    (ProcessingState.PROCESSING_STATE_FAILED, 0.1),
-                    (ProcessingState.PROCESSING_STATE_NOT_STARTED, 0.05)
-                ]
-                rand_val = self.fake.random.random()
-                cumulative = 0
-                state = ProcessingState.PROCESSING_STATE_COMPLETED  # default
-                for s, weight in state_weights:
-                    cumulative += weight
-                    if rand_val <= cumulative:
-                        state = s
-                        break
-                
-                resource = {
-                    "metadata": {
-                        "state": state.value,
-                        "created_time": created_time.isoformat(),
-                        "fetch_time": fetch_time.isoformat(),
-                        "processed_time": processing_time.isoformat() if state == ProcessingState.PROCESSING_STATE_COMPLETED else None,
-                        "identifier": {
-                            "key": f"res_{patient['id']}_{(i + 1):04d}",
-                            "uid": f"{hash(patient['id']) % 10000 + i + 1:04d}",
-                            "patient_id": patient["id"]
-                        },
-                        "resource_type": resource_type,
-                        "version": self.fake.random_element([
-                            FHIRVersion.FHIR_VERSION_R4.value,
-                            FHIRVersion.FHIR_VERSION_R4B.value
-                        ])
-                    },
-                    "human_readable_str": content,
-                    "ai_summary": self.generate_ai_summary(resource_type, content) if state == ProcessingState.PROCESSING_STATE_COMPLETED else None
-                }
+                if state != _STATE_COMPLETED:
+                    ai_summary = None
+                elif resource_type in summary_pools:
+                    ai_summary = next(summary_pools[resource_type])
+                else:
+                    ai_summary = _DEFAULT_AI_SUMMARY
                 
-                resources.append(resource)
-        
-        self.resources = resources
-        return resources
+                yield (
+                    state,
+                    created_time.isoformat(),
+                    fetch_time.isoformat(),
+                    processing_time.isoformat() if state == _STATE_COMPLETED else None,
+                    f"res_{patient['id']}_{(i + 1):04d}",
+                    f"{uid_base + i + 1:04d}",
+                    patient["id"],
+                    resource_type,
+                    rng.choice(_FHIR_VERSIONS),
+                    content,
+                    ai_summary
+                )
     
-    def generate_derived_facts(self, patients: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def generate_derived_facts(
+        self,
+        patients: List[Dict[str, Any]],
+        archetypes: List[PatientArchetype]
+    ) -> List[Dict[str, Any]]:
         """Generate derived clinical facts for trial matching"""
-        facts = []
+        facts: List[Optional[Dict[str, Any]]] = [None] * len(patients)
+        extracted_at = datetime.now().isoformat()
         
-        for patient in patients:
-            archetype = patient["_archetype"]
-            
-            fact = {
-                "patient_id": patient["id"],
-                "age_years": self.fake.random_int(*archetype.age_range),
-                "sex": archetype.sex,
-                "diagnoses": archetype.diagnoses,
-                "medications": archetype.medications,
-                "key_labs": {
-                    "a1c": round(self.fake.random.uniform(*archetype.a1c_range), 1),
-                    "egfr": self.fake.random_int(75, 105),
-                    "ldl": self.fake.random_int(100, 150),
-                    "sbp": self.fake.random_int(135, 155),
-                    "dbp": self.fake.random_int(85, 95)
-                },
-                "exclusions": self.fake.random_sample(
-                    ["pregnancy", "type1_diabetes", "severe_renal_disease"], 
-                    length=self.fake.random_int(0, 1)
-                ),
-                "location": self.fake.zipcode(),
-                "extracted_at": datetime.now().isoformat()
-            }
-            
-            facts.append(fact)
+        # Draw numeric facts in one vectorized batch per archetype
+        groups: Dict[int, Tuple[PatientArchetype, List[int]]] = {}
+        for idx, archetype in enumerate(archetypes):
+            groups.setdefault(id(archetype), (archetype, []))[1].append(idx)
+        
+        for archetype, indices in groups.values():
+            draws = _draw_facts(self._np_rng, len(indices), archetype.age_range, archetype.a1c_range)
+            for idx, (age, a1c, egfr, ldl, sbp, dbp, exclusion) in zip(indices, draws.tolist()):
+                patient = patients[idx]
+                facts[idx] = {
+                    "patient_id": patient["id"],
+                    "age_years": int(age),
+                    "sex": archetype.sex,
+                    "diagnoses": [dict(record) for record in archetype._diag_records],
+                    "medications": list(archetype.medications),
+                    "key_labs": {
+                        "a1c": a1c,
+                        "egfr": int(egfr),
+                        "ldl": int(ldl),
+                        "sbp": int(sbp),
+                        "dbp": int(dbp)
+                    },
+                    "exclusions": [_EXCLUSIONS[int(exclusion)]] if exclusion >= 0 else [],
+                    "location": self.fake.zipcode(),
+                    "extracted_at": extracted_at
+                }
         
         self.derived_facts = facts
         return facts
@@ -394,19 +615,91 @@ Last pharmacy refill: {self.fake.date_between(start_date='-20d').strftime('%m/%d
         num_patients: int = 3, 
         min_resources: int = 3, 
         max_resources: int = 6
-    ) -> Dict[str, List[Dict[str, Any]]]:
-        """Generate complete dataset with patients, resources, and derived facts"""
-        patients = self.generate_patients(num_patients)
-        resources = self.generate_ehr_resources(patients, min_resources, max_resources)
-        derived_facts = self.generate_derived_facts(patients)
-        
-        # Clean archetypes from patient data for serialization
-        for patient in patients:
-            if "_archetype" in patient:
-                del patient["_archetype"]
+    ) -> Dict[str, Any]:
+        """Generate complete dataset with patients, resources (as ResourceColumns), and derived facts"""
+        if num_patients >= PARALLEL_MIN_PATIENTS:
+            patients, resources, derived_facts = self._generate_parallel(
+                num_patients, min_resources, max_resources
+            )
+        else:
+            patients, archetypes = self.generate_patients(num_patients)
+            resources = self.generate_ehr_resources(patients, archetypes, min_resources, max_resources)
+            derived_facts = self.generate_derived_facts(patients, archetypes)
         
         return {
             "patients": patients,
             "resources": resources,
             "derived_facts": derived_facts
         }
+    
+    def _generate_parallel(
+        self,
+        num_patients: int,
+        min_resources: int,
+        max_resources: int
+    ) -> Tuple[List[Dict[str, Any]], ResourceColumns, List[Dict[str, Any]]]:
+        """Shard patient generation across a process pool, one seeded chunk of patients per task"""
+        workers = os.cpu_count() or 1
+        chunk_size = max(1, num_patients // (4 * workers))
+        starts = range(0, num_patients, chunk_size)
+        base_seed = self._rng.getrandbits(32)
+        archetype_idxs = [self._rng.randrange(len(PATIENT_ARCHETYPES)) for _ in range(num_patients)]
+        
+        patients, derived_facts = [], []
+        resources = ResourceColumns()
+        # forkserver children start clean instead of inheriting the parent's threads and locks
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("forkserver")) as executor:
+            chunks = executor.map(
+                _generate_patient_chunk,
+                starts,
+                [base_seed + n for n in range(len(starts))],
+                [archetype_idxs[start:start + chunk_size] for start in starts],
+                repeat(min_resources),
+                repeat(max_resources)
+            )
+            for chunk_patients, chunk_resources, chunk_facts in chunks:
+                patients.extend(chunk_patients)
+                resources.extend(chunk_resources)
+                derived_facts.extend(chunk_facts)
+        
+        self.patients = patients
+        self.resources = resources
+        self.derived_facts = derived_facts
+        return patients, resources, derived_facts
+
+
+# Per-process generator for pool workers; Faker instances are built inside the
+# worker rather than pickled across from the parent
+_worker_generator: Optional[EHRDataGenerator] = None
+
+def _generate_patient_chunk(
+    start: int,
+    seed: int,
+    archetype_idxs: List[int],
+    min_resources: int,
+    max_resources: int
+) -> Tuple[List[Dict[str, Any]], ResourceColumns, List[Dict[str, Any]]]:
+    """Generate a run of patients with their resources and derived facts (runs in a pool worker)"""
+    global _worker_generator
+    if _worker_generator is None:
+        _worker_generator = EHRDataGenerator()
+    generator = _worker_generator
+    generator.seed(seed)
+    
+    fake = generator.fake
+    archetypes = [PATIENT_ARCHETYPES[idx] for idx in archetype_idxs]
+    patients = [
+        generator._build_patient(
+            start + offset,
+            archetype,
+            fake.name(),
+            fake.email(),
+            fake.date_time_between(start_date="-1y").isoformat()
+        )
+        for offset, archetype in enumerate(archetypes)
+    ]
+    # Ship the columns back rather than per-resource dicts; far fewer objects to pickle
+    resources = generator.generate_ehr_resources(patients, archetypes, min_resources, max_resources)
+    facts = generator.generate_derived_facts(patients, archetypes)
+    
+    return patients, resources, facts
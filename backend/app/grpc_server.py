@@ -3,12 +3,17 @@ gRPC Server for EHR Document Processing Service
 Handles document generation, processing, and retrieval using Faker data
 """
 
+import asyncio
 import grpc
-from concurrent import futures
 import logging
-from typing import List, Dict, Any, Optional
+import multiprocessing
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Iterable
 import json
-from datetime import datetime
+import re
+import numpy as np
 
 # Import generated gRPC classes (will be generated from proto)
 import sys
@@ -24,117 +29,282 @@ except ImportError:
     ehr_service_pb2 = None
     ehr_service_pb2_grpc = None
 
-from .data_generator import EHRDataGenerator, ProcessingState, FHIRVersion
+# Shared empty responses for error and not-found paths; never mutated once built
+if ehr_service_pb2 is not None:
+    _EMPTY_RESOURCES_RESPONSE = ehr_service_pb2.GetResourcesResponse()
+    _EMPTY_PATIENT = ehr_service_pb2.PatientProfile()
+    _EMPTY_FACTS = ehr_service_pb2.DerivedClinicalFacts()
+    _EMPTY_PROCESS_RESPONSE = ehr_service_pb2.ProcessDocumentResponse()
+    _EMPTY_PROCESS_BATCH_RESPONSE = ehr_service_pb2.ProcessDocumentBatchResponse()
+
+from .data_generator import EHRDataGenerator, ResourceColumns, ProcessingState, FHIRVersion
+from .clock import CoarseClock
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Condition keywords for mock summaries; one case-insensitive scan, no lowercased copy of the document
+_SUMMARY_KEYWORDS_RE = re.compile(r"(diabetes)|(hypertension)", re.IGNORECASE)
+_DIABETES_RE = re.compile(r"diabetes", re.IGNORECASE)
+
+# Resources per GetResources stream message; bounds the size of each serialized response
+RESOURCE_STREAM_BATCH = 256
+
+# Processed documents keep at most this many characters of their content
+HUMAN_READABLE_MAX_CHARS = 500
+
+def _grown(column: np.ndarray, capacity: int, size: int) -> np.ndarray:
+    """Copy the first `size` entries of a column into a larger buffer"""
+    grown = np.empty(capacity, dtype=column.dtype)
+    grown[:size] = column[:size]
+    return grown
+
+@dataclass
+class ResourceStore:
+    """Stored resources as parallel columns; messages are only built for rows being served"""
+    patient_ids: List[str] = field(default_factory=list)
+    keys: List[str] = field(default_factory=list)
+    uids: List[str] = field(default_factory=list)
+    created_times: List[str] = field(default_factory=list)
+    fetch_times: List[str] = field(default_factory=list)
+    processed_times: List[Optional[str]] = field(default_factory=list)
+    versions: array = field(default_factory=lambda: array('b'))  # FHIRVersion values fit in int8
+    human_readable: List[str] = field(default_factory=list)
+    ai_summaries: List[Optional[str]] = field(default_factory=list)
+    # Resource types are dictionary-encoded: type_codes holds indexes into type_names
+    type_names: List[str] = field(default_factory=list)
+    type_ids: Dict[str, int] = field(default_factory=dict)
+    # Filter columns are NumPy buffers grown by doubling; only the first _size entries are live
+    _states: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int8), repr=False)
+    _type_codes: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int32), repr=False)
+    _size: int = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    @property
+    def states(self) -> np.ndarray:
+        return self._states[:self._size]
+    
+    @property
+    def type_codes(self) -> np.ndarray:
+        return self._type_codes[:self._size]
+    
+    def _type_code(self, resource_type: str) -> int:
+        code = self.type_ids.get(resource_type)
+        if code is None:
+            code = self.type_ids[resource_type] = len(self.type_names)
+            self.type_names.append(sys.intern(resource_type))
+        return code
+    
+    def _reserve(self, extra: int) -> None:
+        needed = self._size + extra
+        if needed > len(self._states):
+            capacity = max(needed, 2 * len(self._states), 64)
+            self._states = _grown(self._states, capacity, self._size)
+            self._type_codes = _grown(self._type_codes, capacity, self._size)
+    
+    def append_row(
+        self,
+        state: int,
+        created_time: str,
+        fetch_time: str,
+        processed_time: Optional[str],
+        key: str,
+        uid: str,
+        patient_id: str,
+        resource_type: str,
+        version: int,
+        human_readable_str: str,
+        ai_summary: Optional[str]
+    ) -> int:
+        """Store one resource from its field values; returns its row index"""
+        self._reserve(1)
+        idx = self._size
+        self._states[idx] = state
+        self._type_codes[idx] = self._type_code(resource_type)
+        # Patient ids repeat across rows; interning keeps one string object per patient
+        self.patient_ids.append(sys.intern(patient_id))
+        self.keys.append(key)
+        self.uids.append(uid)
+        self.created_times.append(created_time)
+        self.fetch_times.append(fetch_time)
+        self.processed_times.append(processed_time)
+        self.versions.append(version)
+        self.human_readable.append(human_readable_str)
+        self.ai_summaries.append(ai_summary)
+        self._size = idx + 1
+        return idx
+    
+    @classmethod
+    def from_columns(cls, columns: ResourceColumns) -> "ResourceStore":
+        store = cls()
+        store._reserve(len(columns))
+        for row in columns.rows():
+            store.append_row(*row)
+        return store
+
+@dataclass(slots=True)
+class PatientRow:
+    """Stored patient profile"""
+    id: str
+    name: Optional[str]
+    email: Optional[str]
+    consent_given: bool
+    preferences: Optional[Dict[str, Any]]
+    created_at: str
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PatientRow":
+        return cls(
+            data["id"],
+            data.get("name"),
+            data.get("email"),
+            data["consent_given"],
+            data.get("preferences"),
+            data["created_at"]
+        )
+
+@dataclass(slots=True)
+class DerivedFactsRow:
+    """Stored derived clinical facts for one patient"""
+    patient_id: str
+    age_years: int
+    sex: str
+    diagnoses: List[Dict[str, str]]
+    medications: List[str]
+    key_labs: Dict[str, Any]
+    exclusions: List[str]
+    location: str
+    extracted_at: str
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DerivedFactsRow":
+        return cls(
+            data["patient_id"],
+            data["age_years"],
+            data["sex"],
+            data["diagnoses"],
+            data["medications"],
+            data["key_labs"],
+            data["exclusions"],
+            data["location"],
+            data["extracted_at"]
+        )
+
 class EHRServiceImpl:
     """Implementation of EHR Service gRPC interface"""
     
+    # Handlers touch storage on the event loop without awaiting in between, so reads
+    # and writes never interleave; generation runs in an executor and swaps storage
+    # in on the loop. Stores are append-only, so a stream keeps a stable snapshot.
+    
     def __init__(self):
         self.data_generator = EHRDataGenerator()
         self.storage = {
             "patients": [],
-            "resources": [],
+            "resources": ResourceStore(),
             "derived_facts": []
         }
+        # Row positions in storage["resources"] per patient, in insert order;
+        # state and type filters are NumPy masks over the store's columns
+        self.index_by_patient: Dict[str, List[int]] = defaultdict(list)
+        self._patient_by_id: Dict[str, PatientRow] = {}
+        self._facts_by_patient: Dict[str, DerivedFactsRow] = {}
+        # Serialized batches for the unfiltered GetResources; dropped whenever storage changes
+        self._all_resources_payloads: Optional[List[bytes]] = None
+        self._clock = CoarseClock()
+        # One generation at a time; the data generator's RNG state is not thread-safe
+        self._generate_lock = asyncio.Lock()
         logger.info("EHR Service initialized")
     
-    def GenerateEHRData(self, request, context):
+    async def GenerateEHRData(self, request, context):
         """Generate mock EHR data using Faker"""
         try:
-            logger.info(f"Generating EHR data for {request.num_patients} patients")
+            logger.info("Generating EHR data for %d patients", request.num_patients)
             
-            # Generate complete dataset
-            dataset = self.data_generator.generate_complete_dataset(
-                num_patients=request.num_patients,
-                min_resources=request.min_resources_per_patient,
-                max_resources=request.max_resources_per_patient
-            )
+            # Generate complete dataset off the event loop; storage is swapped back on it
+            async with self._generate_lock:
+                patients, resources, derived_facts = await asyncio.get_running_loop().run_in_executor(
+                    None, self._generate_dataset, request
+                )
             
             # Store in memory (in production, would store in database)
-            self.storage.update(dataset)
+            self.storage["patients"] = patients
+            self.storage["resources"] = resources
+            self.storage["derived_facts"] = derived_facts
+            self._rebuild_indexes()
             
             # Convert to gRPC response
-            resources = []
-            for resource_data in dataset["resources"]:
-                resource = self._dict_to_ehr_resource(resource_data)
-                resources.append(resource)
-            
             response = ehr_service_pb2.GetResourcesResponse(
-                resources=resources,
                 total_count=len(resources),
                 has_more=False
             )
+            self._batch_rows_to_ehr_resources(response.resources, resources, range(len(resources)))
             
-            logger.info(f"Generated {len(resources)} resources for {request.num_patients} patients")
+            logger.info("Generated %d resources for %d patients", len(resources), request.num_patients)
             return response
             
         except Exception as e:
-            logger.error(f"Error generating EHR data: {str(e)}")
+            logger.error("Error generating EHR data: %s", e)
             context.set_code(grpc.StatusCode.INTERNAL)
             context.set_details(f"Failed to generate EHR data: {str(e)}")
-            return ehr_service_pb2.GetResourcesResponse()
+            return _EMPTY_RESOURCES_RESPONSE
     
-    def GetResources(self, request, context):
-        """Get EHR resources with filtering"""
+    async def GetResources(self, request, context):
+        """Stream EHR resources matching the filters in batches of RESOURCE_STREAM_BATCH"""
         try:
-            resources = self.storage["resources"]
-            
-            # Apply filters
-            if request.patient_id:
-                resources = [r for r in resources if r["metadata"]["identifier"]["patient_id"] == request.patient_id]
-            
-            if request.state_filter and request.state_filter != 0:  # 0 is UNSPECIFIED
-                resources = [r for r in resources if r["metadata"]["state"] == request.state_filter]
-            
-            if request.resource_type_filter:
-                resources = [r for r in resources if r["metadata"]["resource_type"] == request.resource_type_filter]
+            # Bind the store once: the stream yields between batches, and a
+            # GenerateEHRData that lands meanwhile swaps in a new store
+            store = self.storage["resources"]
+            
+            # The unfiltered, unpaginated query streams batches serialized once per dataset
+            if not (request.patient_id or request.state_filter or request.resource_type_filter
+                    or request.limit or request.offset):
+                payloads = self._all_resources_payloads
+                if payloads is None:
+                    payloads = self._all_resources_payloads = [
+                        batch.SerializeToString()
+                        for batch in self._resource_batches(store, list(range(len(store))), len(store), False)
+                    ]
+                for payload in payloads:
+                    yield payload
+                logger.info("Returned %d resources (total: %d)", len(store), len(store))
+                return
+            
+            indices = self._filter_indices(request, store)
             
             # Apply pagination
-            total_count = len(resources)
+            total_count = len(indices)
             start_idx = request.offset
-            end_idx = start_idx + request.limit if request.limit > 0 else len(resources)
-            paginated_resources = resources[start_idx:end_idx]
+            end_idx = start_idx + request.limit if request.limit > 0 else total_count
+            page = indices[start_idx:end_idx].tolist()
             
-            # Convert to gRPC format
-            grpc_resources = []
-            for resource_data in paginated_resources:
-                resource = self._dict_to_ehr_resource(resource_data)
-                grpc_resources.append(resource)
+            for batch in self._resource_batches(store, page, total_count, end_idx < total_count):
+                yield batch
             
-            response = ehr_service_pb2.GetResourcesResponse(
-                resources=grpc_resources,
-                total_count=total_count,
-                has_more=end_idx < total_count
-            )
-            
-            logger.info(f"Returned {len(grpc_resources)} resources (total: {total_count})")
-            return response
+            logger.info("Returned %d resources (total: %d)", len(page), total_count)
             
         except Exception as e:
-            logger.error(f"Error getting resources: {str(e)}")
+            logger.error("Error getting resources: %s", e)
             context.set_code(grpc.StatusCode.INTERNAL)
             context.set_details(f"Failed to get resources: {str(e)}")
-            return ehr_service_pb2.GetResourcesResponse()
     
-    def GetPatient(self, request, context):
+    async def GetPatient(self, request, context):
         """Get patient profile by ID"""
         try:
-            patients = self.storage["patients"]
-            patient_data = next((p for p in patients if p["id"] == request.patient_id), None)
+            patient_data = self._patient_by_id.get(request.patient_id)
             
             if not patient_data:
                 context.set_code(grpc.StatusCode.NOT_FOUND)
                 context.set_details(f"Patient {request.patient_id} not found")
-                return ehr_service_pb2.PatientProfile()
+                return _EMPTY_PATIENT
             
             # Convert to gRPC format
             preferences = None
-            if patient_data.get("preferences"):
-                prefs = patient_data["preferences"]
+            if patient_data.preferences:
+                prefs = patient_data.preferences
                 preferences = ehr_service_pb2.MatchPreferences(
                     preferred_location=prefs.get("preferred_location"),
                     willing_to_travel=prefs.get("willing_to_travel"),
@@ -144,37 +314,36 @@ class EHRServiceImpl:
                 )
             
             patient = ehr_service_pb2.PatientProfile(
-                id=patient_data["id"],
-                name=patient_data.get("name"),
-                email=patient_data.get("email"),
-                consent_given=patient_data["consent_given"],
+                id=patient_data.id,
+                name=patient_data.name,
+                email=patient_data.email,
+                consent_given=patient_data.consent_given,
                 preferences=preferences,
-                created_at=patient_data["created_at"]
+                created_at=patient_data.created_at
             )
             
-            logger.info(f"Retrieved patient {request.patient_id}")
+            logger.info("Retrieved patient %s", request.patient_id)
             return patient
             
         except Exception as e:
-            logger.error(f"Error getting patient: {str(e)}")
+            logger.error("Error getting patient: %s", e)
             context.set_code(grpc.StatusCode.INTERNAL)
             context.set_details(f"Failed to get patient: {str(e)}")
-            return ehr_service_pb2.PatientProfile()
+            return _EMPTY_PATIENT
     
-    def GetDerivedFacts(self, request, context):
+    async def GetDerivedFacts(self, request, context):
         """Get derived clinical facts for patient"""
         try:
-            facts = self.storage["derived_facts"]
-            patient_facts = next((f for f in facts if f["patient_id"] == request.patient_id), None)
+            patient_facts = self._facts_by_patient.get(request.patient_id)
             
             if not patient_facts:
                 context.set_code(grpc.StatusCode.NOT_FOUND)
                 context.set_details(f"Derived facts for patient {request.patient_id} not found")
-                return ehr_service_pb2.DerivedClinicalFacts()
+                return _EMPTY_FACTS
             
             # Convert to gRPC format
             diagnoses = []
-            for diag in patient_facts["diagnoses"]:
+            for diag in patient_facts.diagnoses:
                 diagnosis = ehr_service_pb2.Diagnosis(
                     code=diag["code"],
                     text=diag["text"],
@@ -182,36 +351,37 @@ class EHRServiceImpl:
                 )
                 diagnoses.append(diagnosis)
             
+            labs = patient_facts.key_labs
             key_labs = ehr_service_pb2.KeyLabs(
-                a1c=patient_facts["key_labs"].get("a1c"),
-                egfr=patient_facts["key_labs"].get("egfr"),
-                ldl=patient_facts["key_labs"].get("ldl"),
-                sbp=patient_facts["key_labs"].get("sbp"),
-                dbp=patient_facts["key_labs"].get("dbp")
+                a1c=labs.get("a1c"),
+                egfr=labs.get("egfr"),
+                ldl=labs.get("ldl"),
+                sbp=labs.get("sbp"),
+                dbp=labs.get("dbp")
             )
             
             derived_facts = ehr_service_pb2.DerivedClinicalFacts(
-                patient_id=patient_facts["patient_id"],
-                age_years=patient_facts["age_years"],
-                sex=patient_facts["sex"],
+                patient_id=patient_facts.patient_id,
+                age_years=patient_facts.age_years,
+                sex=patient_facts.sex,
                 diagnoses=diagnoses,
-                medications=patient_facts["medications"],
+                medications=patient_facts.medications,
                 key_labs=key_labs,
-                exclusions=patient_facts["exclusions"],
-                location=patient_facts["location"],
-                extracted_at=patient_facts["extracted_at"]
+                exclusions=patient_facts.exclusions,
+                location=patient_facts.location,
+                extracted_at=patient_facts.extracted_at
             )
             
-            logger.info(f"Retrieved derived facts for patient {request.patient_id}")
+            logger.info("Retrieved derived facts for patient %s", request.patient_id)
             return derived_facts
             
         except Exception as e:
-            logger.error(f"Error getting derived facts: {str(e)}")
+            logger.error("Error getting derived facts: %s", e)
             context.set_code(grpc.StatusCode.INTERNAL)
             context.set_details(f"Failed to get derived facts: {str(e)}")
-            return ehr_service_pb2.DerivedClinicalFacts()
+            return _EMPTY_FACTS
     
-    def ProcessDocument(self, request, context):
+    async def ProcessDocument(self, request, context):
         """Process a new document (simulate document intelligence)"""
         try:
             # In a real implementation, this would:
@@ -220,84 +390,182 @@ class EHRServiceImpl:
             # 3. Update derived clinical facts
             
             # For this demo, we'll simulate processing
-            logger.info(f"Processing document for patient {request.patient_id}")
-            
-            # Generate a new resource based on the input
-            resource_id = len(self.storage["resources"]) + 1
-            processed_time = datetime.now()
-            
-            # Simulate AI summary generation
-            ai_summary = self._generate_mock_ai_summary(request.resource_type, request.document_content)
-            
-            resource_data = {
-                "metadata": {
-                    "state": ProcessingState.PROCESSING_STATE_COMPLETED.value,
-                    "created_time": processed_time.isoformat(),
-                    "fetch_time": processed_time.isoformat(),
-                    "processed_time": processed_time.isoformat(),
-                    "identifier": {
-                        "key": f"res_{request.patient_id}_{resource_id:04d}",
-                        "uid": f"{resource_id:04d}",
-                        "patient_id": request.patient_id
-                    },
-                    "resource_type": request.resource_type,
-                    "version": FHIRVersion.FHIR_VERSION_R4.value
-                },
-                "human_readable_str": request.document_content[:500],  # Truncate for demo
-                "ai_summary": ai_summary
-            }
+            logger.info("Processing document for patient %s", request.patient_id)
             
-            # Store the processed resource
-            self.storage["resources"].append(resource_data)
+            response = ehr_service_pb2.ProcessDocumentResponse()
+            self._process_document(request, self._clock.now_iso(), response)
             
-            # Generate/update derived facts (simplified)
-            derived_facts_data = self._extract_mock_facts(request.patient_id, request.document_content)
+            logger.info("Successfully processed document for patient %s", request.patient_id)
+            return response
             
-            # Convert to gRPC response
-            processed_resource = self._dict_to_ehr_resource(resource_data)
-            derived_facts = self._dict_to_derived_facts(derived_facts_data)
+        except Exception as e:
+            logger.error("Error processing document: %s", e)
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(f"Failed to process document: {str(e)}")
+            return _EMPTY_PROCESS_RESPONSE
+    
+    async def ProcessDocumentBatch(self, request, context):
+        """Process several documents in one call, sharing one processing timestamp"""
+        try:
+            logger.info("Processing batch of %d documents", len(request.items))
             
-            response = ehr_service_pb2.ProcessDocumentResponse(
-                processed_resource=processed_resource,
-                derived_facts=derived_facts
-            )
+            response = ehr_service_pb2.ProcessDocumentBatchResponse()
+            processed_at = self._clock.now_iso()
+            for item in request.items:
+                self._process_document(item, processed_at, response.results.add())
             
-            logger.info(f"Successfully processed document for patient {request.patient_id}")
+            logger.info("Successfully processed batch of %d documents", len(request.items))
             return response
             
         except Exception as e:
-            logger.error(f"Error processing document: {str(e)}")
+            logger.error("Error processing document batch: %s", e)
             context.set_code(grpc.StatusCode.INTERNAL)
-            context.set_details(f"Failed to process document: {str(e)}")
-            return ehr_service_pb2.ProcessDocumentResponse()
+            context.set_details(f"Failed to process document batch: {str(e)}")
+            return _EMPTY_PROCESS_BATCH_RESPONSE
     
-    def _dict_to_ehr_resource(self, resource_data: Dict[str, Any]):
-        """Convert dictionary to gRPC EHRResourceJson"""
-        metadata = resource_data["metadata"]
-        identifier = metadata["identifier"]
+    def _process_document(self, request, processed_at: str, response) -> None:
+        """Store one processed document and fill its ProcessDocumentResponse"""
+        # processed_at is one ISO timestamp shared by every time field of the resource and its facts
+        # Generate a new resource based on the input
+        resource_id = len(self.storage["resources"]) + 1
         
-        grpc_identifier = ehr_service_pb2.EHRResourceIdentifier(
-            key=identifier["key"],
-            uid=identifier["uid"],
-            patient_id=identifier["patient_id"]
-        )
+        # Simulate AI summary generation
+        content = request.document_content
+        ai_summary = self._generate_mock_ai_summary(request.resource_type, content)
         
-        grpc_metadata = ehr_service_pb2.EHRResourceMetadata(
-            state=metadata["state"],
-            created_time=metadata["created_time"],
-            fetch_time=metadata["fetch_time"],
-            processed_time=metadata.get("processed_time"),
-            identifier=grpc_identifier,
-            resource_type=metadata["resource_type"],
-            version=metadata["version"]
+        # Store the processed resource
+        store = self.storage["resources"]
+        row = store.append_row(
+            ProcessingState.PROCESSING_STATE_COMPLETED.value,
+            processed_at,
+            processed_at,
+            processed_at,
+            f"res_{request.patient_id}_{resource_id:04d}",
+            f"{resource_id:04d}",
+            request.patient_id,
+            request.resource_type,
+            FHIRVersion.FHIR_VERSION_R4.value,
+            # Truncate for demo; short documents keep the request's string as-is
+            content if len(content) <= HUMAN_READABLE_MAX_CHARS else content[:HUMAN_READABLE_MAX_CHARS],
+            ai_summary
         )
+        self._all_resources_payloads = None
+        self._index_row(store, row)
+        
+        # Generate/update derived facts (simplified)
+        derived_facts_data = self._extract_mock_facts(request.patient_id, content, processed_at)
         
-        return ehr_service_pb2.EHRResourceJson(
-            metadata=grpc_metadata,
-            human_readable_str=resource_data["human_readable_str"],
-            ai_summary=resource_data.get("ai_summary")
+        # Convert to gRPC response
+        response.derived_facts.CopyFrom(self._dict_to_derived_facts(derived_facts_data))
+        self._fill_ehr_resource(
+            response.processed_resource, store, row,
+            store.states[row].item(), store.type_codes[row].item()
+        )
+    
+    def _generate_dataset(self, request):
+        """Generate a dataset and convert it to storage rows (runs in the default executor)"""
+        dataset = self.data_generator.generate_complete_dataset(
+            num_patients=request.num_patients,
+            min_resources=request.min_resources_per_patient,
+            max_resources=request.max_resources_per_patient
+        )
+        return (
+            [PatientRow.from_dict(p) for p in dataset["patients"]],
+            ResourceStore.from_columns(dataset["resources"]),
+            [DerivedFactsRow.from_dict(f) for f in dataset["derived_facts"]]
         )
     
+    def _index_row(self, store: ResourceStore, idx: int) -> None:
+        """Add one stored resource row to the patient index"""
+        self.index_by_patient[store.patient_ids[idx]].append(idx)
+    
+    def _rebuild_indexes(self) -> None:
+        """Rebuild the lookup indexes after storage is replaced"""
+        self._all_resources_payloads = None
+        self._patient_by_id = {p.id: p for p in self.storage["patients"]}
+        self._facts_by_patient = {f.patient_id: f for f in self.storage["derived_facts"]}
+        self.index_by_patient.clear()
+        store = self.storage["resources"]
+        for idx in range(len(store)):
+            self._index_row(store, idx)
+    
+    def _filter_indices(self, request, store: ResourceStore) -> np.ndarray:
+        """Row positions in `store` matching the request filters, in storage order"""
+        # (column, wanted value) checks for the state and type filters
+        checks = []
+        if request.state_filter and request.state_filter != 0:  # 0 is UNSPECIFIED
+            checks.append((store.states, request.state_filter))
+        if request.resource_type_filter:
+            code = store.type_ids.get(request.resource_type_filter)
+            if code is None:
+                return np.empty(0, dtype=np.intp)
+            checks.append((store.type_codes, code))
+        
+        if request.patient_id:
+            # The patient bucket is the most selective; check only its rows
+            rows = np.asarray(self.index_by_patient.get(request.patient_id, ()), dtype=np.intp)
+            for column, wanted in checks:
+                rows = rows[column[rows] == wanted]
+            return rows
+        
+        if not checks:
+            return np.arange(len(store))
+        
+        column, wanted = checks[0]
+        mask = column == wanted
+        for column, wanted in checks[1:]:
+            mask &= column == wanted
+        return np.flatnonzero(mask)
+    
+    def _resource_batches(self, store: ResourceStore, page: List[int], total_count: int, has_more: bool):
+        """Yield GetResourcesResponse messages of up to RESOURCE_STREAM_BATCH rows of `page`"""
+        # Every batch carries the page-level total_count/has_more; an empty
+        # page still yields one response so the client gets the count
+        for batch_start in range(0, max(len(page), 1), RESOURCE_STREAM_BATCH):
+            response = ehr_service_pb2.GetResourcesResponse(
+                total_count=total_count,
+                has_more=has_more
+            )
+            self._batch_rows_to_ehr_resources(
+                response.resources, store, page[batch_start:batch_start + RESOURCE_STREAM_BATCH]
+            )
+            yield response
+    
+    def _batch_rows_to_ehr_resources(self, target, store: ResourceStore, indices: Iterable[int]) -> None:
+        """Append stored resource rows to a repeated EHRResourceJson field in place"""
+        add = target.add
+        fill = self._fill_ehr_resource
+        rows = list(indices)
+        # Gather the NumPy filter columns once per batch as plain ints
+        states = store.states[rows].tolist()
+        type_codes = store.type_codes[rows].tolist()
+        for i, state, type_code in zip(rows, states, type_codes):
+            fill(add(), store, i, state, type_code)
+    
+    def _fill_ehr_resource(self, resource, store: ResourceStore, i: int, state: int, type_code: int) -> None:
+        """Set one stored row's fields on an EHRResourceJson message"""
+        # Filling a message owned by its parent (from add() or a singular field)
+        # avoids building standalone messages that the constructor then copies
+        grpc_metadata = resource.metadata
+        grpc_metadata.state = state
+        grpc_metadata.created_time = store.created_times[i]
+        grpc_metadata.fetch_time = store.fetch_times[i]
+        processed_time = store.processed_times[i]
+        if processed_time is not None:
+            grpc_metadata.processed_time = processed_time
+        grpc_metadata.resource_type = store.type_names[type_code]
+        grpc_metadata.version = store.versions[i]
+        
+        grpc_identifier = grpc_metadata.identifier
+        grpc_identifier.key = store.keys[i]
+        grpc_identifier.uid = store.uids[i]
+        grpc_identifier.patient_id = store.patient_ids[i]
+        
+        resource.human_readable_str = store.human_readable[i]
+        ai_summary = store.ai_summaries[i]
+        if ai_summary is not None:
+            resource.ai_summary = ai_summary
+    
     def _dict_to_derived_facts(self, facts_data: Dict[str, Any]):
         """Convert dictionary to gRPC DerivedClinicalFacts"""
         # Implementation would convert facts dictionary to gRPC message
@@ -310,44 +578,109 @@ class EHRServiceImpl:
     
     def _generate_mock_ai_summary(self, resource_type: str, content: str) -> str:
         """Generate mock AI summary based on content"""
-        if "diabetes" in content.lower():
+        match = _SUMMARY_KEYWORDS_RE.search(content)
+        if match and (match.lastindex == 1 or _DIABETES_RE.search(content, match.end())):
+            # Diabetes wins even when hypertension is mentioned first
             return "Diabetes management notes reviewed; monitoring blood glucose levels."
-        elif "hypertension" in content.lower():
+        elif match:
             return "Hypertension monitoring; blood pressure management ongoing."
         elif "lab" in resource_type.lower():
             return "Laboratory results show values within expected ranges for chronic conditions."
         else:
             return "Clinical documentation reviewed and processed successfully."
     
-    def _extract_mock_facts(self, patient_id: str, content: str) -> Dict[str, Any]:
+    def _extract_mock_facts(self, patient_id: str, content: str, extracted_at: str) -> Dict[str, Any]:
         """Extract mock clinical facts from document content"""
         return {
             "patient_id": patient_id,
             "age_years": 55,  # Mock extraction
             "sex": "female",
-            "extracted_at": datetime.now().isoformat()
+            "extracted_at": extracted_at
         }
 
-def serve():
+def _serialize_response(message) -> bytes:
+    """Response serializer that passes already-serialized payloads through"""
+    return message if isinstance(message, bytes) else message.SerializeToString()
+
+def add_servicer_to_server(servicer, server) -> None:
+    """Register the servicer like add_EHRServiceServicer_to_server, but let
+    GetResources stream pre-serialized bytes as well as messages
+    
+    The method table is built from the generated service descriptor, so it
+    follows the proto; only the response serializer differs from the stub's.
+    """
+    service = ehr_service_pb2.DESCRIPTOR.services_by_name["EHRService"]
+    rpc_method_handlers = {}
+    for method in service.methods:
+        handler_factory = (
+            grpc.unary_stream_rpc_method_handler if method.server_streaming
+            else grpc.unary_unary_rpc_method_handler
+        )
+        rpc_method_handlers[method.name] = handler_factory(
+            getattr(servicer, method.name),
+            request_deserializer=getattr(ehr_service_pb2, method.input_type.name).FromString,
+            response_serializer=_serialize_response
+        )
+    server.add_generic_rpc_handlers((
+        grpc.method_handlers_generic_handler(service.full_name, rpc_method_handlers),
+    ))
+
+async def serve(reuse_port: bool = False):
     """Start the gRPC server"""
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+    options = [("grpc.so_reuseport", 1)] if reuse_port else None
+    server = grpc.aio.server(options=options)
     
     if ehr_service_pb2_grpc:
-        ehr_service_pb2_grpc.add_EHRServiceServicer_to_server(
-            EHRServiceImpl(), server
-        )
+        add_servicer_to_server(EHRServiceImpl(), server)
     
     listen_addr = "[::]:50051"
     server.add_insecure_port(listen_addr)
     
-    logger.info(f"Starting gRPC server on {listen_addr}")
-    server.start()
+    logger.info("Starting gRPC server on %s (pid %d)", listen_addr, os.getpid())
+    await server.start()
+    
+    try:
+        await server.wait_for_termination()
+    finally:
+        await server.stop(0)
+
+def _run_worker() -> None:
+    """Entry point for one SO_REUSEPORT server process"""
+    try:
+        asyncio.run(serve(reuse_port=True))
+    except KeyboardInterrupt:
+        pass
+
+def run(workers: int = 1) -> None:
+    """Run the server in this process, or in `workers` processes sharing the port.
+    
+    With several workers the kernel spreads connections across processes, but
+    each one keeps its own in-memory storage: data generated through one worker
+    is not visible from the others.
+    """
+    if workers <= 1:
+        try:
+            asyncio.run(serve())
+        except KeyboardInterrupt:
+            logger.info("Server stopped by user")
+        return
     
+    ctx = multiprocessing.get_context("spawn")
+    processes = [ctx.Process(target=_run_worker) for _ in range(workers)]
+    for process in processes:
+        process.start()
     try:
-        server.wait_for_termination()
+        for process in processes:
+            process.join()
     except KeyboardInterrupt:
+        # Workers share the terminal's process group and get the interrupt too;
+        # terminate any that are still up after a grace period
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
         logger.info("Server stopped by user")
-        server.stop(0)
 
 if __name__ == "__main__":
-    serve()
+    # GRPC_WORKERS > 1 opts in to multi-process serving; see run()
+    run(int(os.environ.get("GRPC_WORKERS", "1")))
@@ -3,20 +3,27 @@ FastAPI application that provides REST API endpoints
 Connects to gRPC backend for EHR document processing
 """
 
-from fastapi import FastAPI, HTTPException, Query, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Query, BackgroundTasks, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional, Dict, Any, Sequence, Iterable, Callable
+from itertools import count, islice, starmap
 import grpc
+import hashlib
+import orjson
 import asyncio
 import logging
-from datetime import datetime
+import threading
+import uuid
 
 # Import data generator for direct use (fallback when gRPC not available)
 from .data_generator import EHRDataGenerator
+from .clock import CoarseClock
 from .medallion_pipeline import (
     MedallionTransformer, 
     BronzeDocument,
+    SilverClinicalEntity,
     create_medallion_pipeline,
     GoldPatientProfile
 )
@@ -28,28 +35,245 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="EHR Document Processing API",
     description="REST API for EHR document extraction and clinical trial matching",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware for frontend development
+# Starlette checks `origin in allow_origins` per request; a frozenset makes that a hash lookup
+ALLOWED_ORIGINS = frozenset({"http://localhost:3000", "http://127.0.0.1:3000"})
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://127.0.0.1:3000"],
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Storage is normalized to the camelCase API shape once, at ingestion, so
+# handlers return stored records as-is
+
+def format_resource(
+    state: int,
+    created_time: str,
+    fetch_time: str,
+    processed_time: Optional[str],
+    key: str,
+    uid: str,
+    patient_id: str,
+    resource_type: str,
+    version: int,
+    human_readable_str: str,
+    ai_summary: Optional[str]
+) -> Dict[str, Any]:
+    """Build the camelCase shape of one generated resource row (match TypeScript schema)"""
+    return {
+        "metadata": {
+            "state": state,
+            "createdTime": created_time,
+            "fetchTime": fetch_time,
+            "processedTime": processed_time,
+            "identifier": {
+                "key": key,
+                "uid": uid,
+                "patientId": patient_id
+            },
+            "resourceType": resource_type,
+            "version": version
+        },
+        "humanReadableStr": human_readable_str,
+        "aiSummary": ai_summary
+    }
+
+def format_patient(patient: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a generated patient to its camelCase shape"""
+    return {
+        "id": patient["id"],
+        "name": patient.get("name"),
+        "email": patient.get("email"),
+        "consentGiven": patient["consent_given"],
+        "preferences": patient.get("preferences"),
+        "createdAt": patient["created_at"]
+    }
+
+def format_derived_facts(facts: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert generated derived facts to their camelCase shape"""
+    return {
+        "patientId": facts["patient_id"],
+        "ageYears": facts["age_years"],
+        "sex": facts["sex"],
+        "diagnoses": facts["diagnoses"],
+        "medications": facts["medications"],
+        "keyLabs": facts["key_labs"],
+        "exclusions": facts["exclusions"],
+        "location": facts["location"],
+        "extractedAt": facts["extracted_at"]
+    }
+
+def format_silver_entity(entity: SilverClinicalEntity) -> Dict[str, Any]:
+    """Convert a silver entity to its response shape"""
+    return {
+        "entity_type": entity.entity_type,
+        "entity_value": entity.entity_value,
+        "confidence_score": entity.confidence_score,
+        "extracted_from": entity.extracted_from,
+        "normalized_code": entity.normalized_code,
+        "quality_score": entity._quality_score,
+        "processed_at": entity._processed_at
+    }
+
+def format_gold_profile(profile: GoldPatientProfile) -> Dict[str, Any]:
+    """Convert a gold profile to its response shape"""
+    return {
+        "patient_id": profile.patient_id,
+        "age_years": profile.age_years,
+        "sex": profile.sex,
+        "primary_conditions": profile.primary_conditions,
+        "comorbidities": profile.comorbidities,
+        "current_medications": profile.current_medications,
+        "contraindications": profile.contraindications,
+        "geographic_location": profile.geographic_location,
+        "trial_eligibility_factors": profile.trial_eligibility_factors,
+        "business_value": profile._business_value,
+        "enriched_at": profile._enriched_at
+    }
+
+def summarize_silver_entity(entity: SilverClinicalEntity) -> Dict[str, Any]:
+    """Short form of a silver entity returned by process-document"""
+    return {
+        "type": entity.entity_type,
+        "value": entity.entity_value,
+        "confidence": entity.confidence_score,
+        "code": entity.normalized_code
+    }
+
+class ResourceIndex:
+    """Resource list with secondary indexes on patient ID, state and resource type
+    
+    Resources are stored in their camelCase response shape. Indexes hold
+    positions into ``resources`` and are maintained on insert, so filtered
+    queries touch only the matching rows instead of scanning the list.
+    Positions are only ever appended, so every bucket is already sorted.
+    """
+    
+    def __init__(self, resources: Optional[Iterable[Dict[str, Any]]] = None):
+        self.resources: List[Dict[str, Any]] = []
+        self.by_patient: Dict[str, List[int]] = {}
+        self.by_state: Dict[int, List[int]] = {}
+        self.by_type: Dict[str, List[int]] = {}
+        # State and type of each position, for filtering another bucket's positions
+        self.states: List[int] = []
+        self.types: List[str] = []
+        if resources:
+            self.extend(resources)
+    
+    def __len__(self) -> int:
+        return len(self.resources)
+    
+    def __getitem__(self, idx: int) -> Dict[str, Any]:
+        return self.resources[idx]
+    
+    def add(self, resource: Dict[str, Any]) -> int:
+        """Append a resource and index it; returns its position"""
+        idx = len(self.resources)
+        self.resources.append(resource)
+        metadata = resource["metadata"]
+        self.by_patient.setdefault(metadata["identifier"]["patientId"], []).append(idx)
+        self.by_state.setdefault(metadata["state"], []).append(idx)
+        self.by_type.setdefault(metadata["resourceType"], []).append(idx)
+        self.states.append(metadata["state"])
+        self.types.append(metadata["resourceType"])
+        return idx
+    
+    def extend(self, resources: Iterable[Dict[str, Any]]):
+        for resource in resources:
+            self.add(resource)
+    
+    def query(
+        self,
+        patient_id: Optional[str] = None,
+        state: Optional[int] = None,
+        resource_type: Optional[str] = None
+    ) -> Sequence[int]:
+        """Positions of resources matching every given filter, in insertion order
+        
+        May return one of the index's own buckets; callers must not modify it.
+        """
+        plan = QUERY_PLANS[bool(patient_id), state is not None, bool(resource_type)]
+        return plan(self, patient_id, state, resource_type)
+
+def _query_plan(by_patient: bool, by_state: bool, by_type: bool):
+    """Build the lookup for one combination of active filters, with no per-row filter checks"""
+    if by_patient:
+        # Patient buckets are already in insertion order; keep rows whose state/type match
+        if by_state and by_type:
+            def plan(index, patient_id, state, resource_type):
+                states, types = index.states, index.types
+                return [i for i in index.by_patient.get(patient_id, ()) if states[i] == state and types[i] == resource_type]
+        elif by_state:
+            def plan(index, patient_id, state, resource_type):
+                states = index.states
+                return [i for i in index.by_patient.get(patient_id, ()) if states[i] == state]
+        elif by_type:
+            def plan(index, patient_id, state, resource_type):
+                types = index.types
+                return [i for i in index.by_patient.get(patient_id, ()) if types[i] == resource_type]
+        else:
+            def plan(index, patient_id, state, resource_type):
+                return index.by_patient.get(patient_id, ())
+    elif by_state and by_type:
+        # Walk the smaller sorted bucket and check the other filter on each position
+        def plan(index, patient_id, state, resource_type):
+            state_rows = index.by_state.get(state, ())
+            type_rows = index.by_type.get(resource_type, ())
+            if len(state_rows) <= len(type_rows):
+                types = index.types
+                return [i for i in state_rows if types[i] == resource_type]
+            states = index.states
+            return [i for i in type_rows if states[i] == state]
+    elif by_state:
+        def plan(index, patient_id, state, resource_type):
+            return index.by_state.get(state, ())
+    elif by_type:
+        def plan(index, patient_id, state, resource_type):
+            return index.by_type.get(resource_type, ())
+    else:
+        def plan(index, patient_id, state, resource_type):
+            return range(len(index.resources))
+    return plan
+
+# Specialized ResourceIndex.query lookups keyed by (patient, state, type) filter presence
+QUERY_PLANS = {
+    (by_patient, by_state, by_type): _query_plan(by_patient, by_state, by_type)
+    for by_patient in (False, True)
+    for by_state in (False, True)
+    for by_type in (False, True)
+}
+
 # Global instances
 data_generator = EHRDataGenerator()
 medallion_pipeline = create_medallion_pipeline()
 mock_storage = {
     "patients": [],
-    "resources": [],
+    "resources": ResourceIndex(),
     "derived_facts": [],
+    # Each patient's response view, pre-serialized
+    "patient_fragments": [],
+    # Lookup maps keyed by patient ID
+    "patients_by_id": {},
+    "facts_by_patient": {},
     "bronze_documents": [],
     "silver_entities": [],
-    "gold_profiles": []
+    # Response views of silver entities, in full and bucketed by entity type
+    "formatted_silver_entities": [],
+    "silver_by_type": {},
+    # Keyed by patient ID; a replaced profile moves to the end, as in upload order
+    "gold_profiles": {},
+    "gold_profile_fragments": {},
+    # Running totals behind the pipeline-stats averages
+    "silver_confidence_sum": 0.0,
+    "gold_business_value_sum": 0.0
 }
 
 # Pydantic models matching TypeScript interfaces
@@ -110,17 +334,155 @@ class DerivedClinicalFacts(BaseModel):
     location: str
     extracted_at: str = Field(alias="extractedAt")
 
+# Request bodies are read-only inputs: freeze them and drop unknown keys
+REQUEST_MODEL_CONFIG = ConfigDict(populate_by_name=True, frozen=True, extra="ignore")
+
 class GenerateDataRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+    
     num_patients: int = Field(5, ge=1, le=10)
     min_resources_per_patient: int = Field(4, ge=1, le=10)
     max_resources_per_patient: int = Field(8, ge=1, le=15)
     condition_focus: List[str] = Field(["diabetes", "hypertension"])
 
 class ProcessDocumentRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+    
     patient_id: str = Field(alias="patientId")
     resource_type: str = Field(alias="resourceType")
     document_content: str = Field(alias="documentContent")
 
+# Serializes dataset generation; the generator's RNG and Faker are not thread-safe
+generate_lock = asyncio.Lock()
+# Guards in-place storage updates made from worker threads
+storage_lock = threading.Lock()
+# Timestamps for health checks and processed documents; 100 ms resolution is plenty for mock data
+clock = CoarseClock(resolution=0.1)
+# Bronze documents are never reset, so a counter replaces len() for their IDs
+next_document_number = count(1).__next__
+
+def build_storage(num_patients: int, min_resources: int, max_resources: int) -> Dict[str, Any]:
+    """Generate a dataset and build its indexed storage (runs in the default executor)"""
+    dataset = data_generator.generate_complete_dataset(
+        num_patients=num_patients,
+        min_resources=min_resources,
+        max_resources=max_resources
+    )
+    patients = [format_patient(p) for p in dataset["patients"]]
+    derived_facts = [format_derived_facts(f) for f in dataset["derived_facts"]]
+    return {
+        "patients": patients,
+        "resources": ResourceIndex(starmap(format_resource, dataset["resources"].rows())),
+        "derived_facts": derived_facts,
+        "patient_fragments": [orjson.dumps(p) for p in patients],
+        "patients_by_id": {p["id"]: p for p in patients},
+        "facts_by_patient": {f["patientId"]: f for f in derived_facts}
+    }
+
+def swap_storage(storage: Dict[str, Any]) -> None:
+    """Swap a built dataset into storage in one step, so handlers never see a partial one"""
+    with storage_lock:
+        mock_storage.update(storage)
+
+async def regenerate_storage(num_patients: int, min_resources: int, max_resources: int):
+    """Build a new dataset off the event loop and swap it into storage"""
+    async with generate_lock:
+        storage = await asyncio.get_running_loop().run_in_executor(
+            None, build_storage, num_patients, min_resources, max_resources
+        )
+    # storage_lock can be held for a whole document run, so wait for it off the loop
+    await asyncio.to_thread(swap_storage, storage)
+    patients_cache.invalidate()
+
+async def run_generation_job(job_id: str, request: GenerateDataRequest):
+    """Background task for POST /api/generate-data"""
+    try:
+        await regenerate_storage(
+            request.num_patients,
+            request.min_resources_per_patient,
+            request.max_resources_per_patient
+        )
+        logger.info(f"Generation job {job_id}: {len(mock_storage['resources'])} resources for {request.num_patients} patients")
+    except Exception as e:
+        logger.error(f"Generation job {job_id} failed: {str(e)}")
+
+# Items serialized per chunk by stream_json_list
+STREAM_BATCH = 256
+
+def stream_json_list(key: str, items: Iterable[Dict[str, Any]], extra: Optional[Dict[str, Any]] = None) -> StreamingResponse:
+    """Stream ``{key: [items...], **extra}`` as JSON, serializing items in batches"""
+    def body():
+        yield b'{' + orjson.dumps(key) + b':['
+        iterator = iter(items)
+        separator = b''
+        while batch := list(islice(iterator, STREAM_BATCH)):
+            # Serialize the batch as an array and splice in its contents
+            yield separator + orjson.dumps(batch)[1:-1]
+            separator = b','
+        yield b'],' + orjson.dumps(extra)[1:] if extra else b']}'
+    
+    return StreamingResponse(body(), media_type="application/json")
+
+def json_list_body(key: str, fragments: Iterable[bytes]) -> bytes:
+    """``{key: [...]}`` assembled from already-serialized items"""
+    return b'{' + orjson.dumps(key) + b':[' + b','.join(fragments) + b']}'
+
+class JSONCache:
+    """Serialized JSON body with an ETag, rebuilt on the first request after invalidate()"""
+    
+    def __init__(self, build: Callable[[], bytes]):
+        self._build = build
+        self._entry = None  # (body, etag)
+        self._version = 0
+        self._lock = threading.Lock()
+    
+    def invalidate(self):
+        with self._lock:
+            self._version += 1
+            self._entry = None
+    
+    def response(self, request: Request) -> Response:
+        entry = self._entry
+        if entry is None:
+            version = self._version
+            body = self._build()
+            entry = (body, f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"')
+            with self._lock:
+                # Don't cache a body built from data that changed while it was being built
+                if version == self._version:
+                    self._entry = entry
+        
+        body, etag = entry
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+            return Response(status_code=304, headers={"ETag": etag})
+        return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+def build_pipeline_stats() -> Dict[str, Any]:
+    """Medallion pipeline and storage statistics"""
+    # process_document_sync updates the transformer and these sums under the same lock
+    with storage_lock:
+        stats = medallion_pipeline.get_pipeline_stats()
+        storage_stats = {
+            "bronze_documents": len(mock_storage["bronze_documents"]),
+            "silver_entities": len(mock_storage["silver_entities"]),
+            "gold_profiles": len(mock_storage["gold_profiles"])
+        }
+        
+        return {
+            "pipeline_stats": stats,
+            "storage_stats": storage_stats,
+            "data_quality": {
+                "avg_entity_confidence": mock_storage["silver_confidence_sum"] / len(mock_storage["silver_entities"]) if mock_storage["silver_entities"] else 0,
+                "avg_business_value": mock_storage["gold_business_value_sum"] / len(mock_storage["gold_profiles"]) if mock_storage["gold_profiles"] else 0
+            }
+        }
+
+# Invalidated by regenerate_storage and process_document_sync
+patients_cache = JSONCache(lambda: json_list_body("patients", mock_storage["patient_fragments"]))
+gold_profiles_cache = JSONCache(lambda: json_list_body("gold_profiles", mock_storage["gold_profile_fragments"].values()))
+pipeline_stats_cache = JSONCache(lambda: orjson.dumps(build_pipeline_stats()))
+
 # Utility function to connect to gRPC (optional)
 async def get_grpc_client():
     """Get gRPC client connection (optional for demo)"""
@@ -138,12 +500,7 @@ async def startup_event():
     logger.info("Initializing EHR API server...")
     
     # Generate initial mock data
-    dataset = data_generator.generate_complete_dataset(
-        num_patients=5,
-        min_resources=4,
-        max_resources=8
-    )
-    mock_storage.update(dataset)
+    await regenerate_storage(num_patients=5, min_resources=4, max_resources=8)
     
     logger.info(f"Generated {len(mock_storage['patients'])} patients with {len(mock_storage['resources'])} resources")
 
@@ -153,7 +510,7 @@ async def root():
     return {
         "service": "EHR Document Processing API",
         "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": clock.now_iso(),
         "data_stats": {
             "patients": len(mock_storage["patients"]),
             "resources": len(mock_storage["resources"]),
@@ -161,30 +518,21 @@ async def root():
         }
     }
 
-@app.post("/api/generate-data")
+@app.post("/api/generate-data", status_code=202)
 async def generate_data(request: GenerateDataRequest, background_tasks: BackgroundTasks):
-    """Generate new mock EHR data"""
+    """Generate new mock EHR data in the background"""
     try:
-        logger.info(f"Generating data for {request.num_patients} patients")
-        
-        # Generate data using Faker
-        dataset = data_generator.generate_complete_dataset(
-            num_patients=request.num_patients,
-            min_resources=request.min_resources_per_patient,
-            max_resources=request.max_resources_per_patient
-        )
+        job_id = uuid.uuid4().hex
+        logger.info(f"Generation job {job_id}: generating data for {request.num_patients} patients")
         
-        # Update storage
-        mock_storage.update(dataset)
+        # Generate data using Faker after the response is sent
+        background_tasks.add_task(run_generation_job, job_id, request)
         
         return {
             "success": True,
-            "message": f"Generated {len(dataset['resources'])} resources for {request.num_patients} patients",
-            "data": {
-                "patients_count": len(dataset["patients"]),
-                "resources_count": len(dataset["resources"]),
-                "derived_facts_count": len(dataset["derived_facts"])
-            }
+            "status": "accepted",
+            "job_id": job_id,
+            "message": f"Generating data for {request.num_patients} patients"
         }
         
     except Exception as e:
@@ -192,7 +540,7 @@ async def generate_data(request: GenerateDataRequest, background_tasks: Backgrou
         raise HTTPException(status_code=500, detail=f"Failed to generate data: {str(e)}")
 
 @app.get("/api/patients/{patient_id}/resources")
-async def get_patient_resources(
+def get_patient_resources(
     patient_id: str,
     state_filter: Optional[int] = Query(None, description="Filter by processing state"),
     resource_type_filter: Optional[str] = Query(None, description="Filter by resource type"),
@@ -203,54 +551,25 @@ async def get_patient_resources(
     try:
         resources = mock_storage["resources"]
         
-        # Filter by patient ID
-        patient_resources = [r for r in resources if r["metadata"]["identifier"]["patient_id"] == patient_id]
-        
-        # Apply additional filters
-        if state_filter is not None:
-            patient_resources = [r for r in patient_resources if r["metadata"]["state"] == state_filter]
-        
-        if resource_type_filter:
-            patient_resources = [r for r in patient_resources if r["metadata"]["resource_type"] == resource_type_filter]
+        # Look up matching positions from the patient, state and type indexes
+        matches = resources.query(patient_id, state_filter, resource_type_filter)
         
         # Apply pagination
-        total_count = len(patient_resources)
-        paginated_resources = patient_resources[offset:offset + limit]
-        
-        # Convert to response format (match TypeScript schema)
-        formatted_resources = []
-        for resource in paginated_resources:
-            formatted_resource = {
-                "metadata": {
-                    "state": resource["metadata"]["state"],
-                    "createdTime": resource["metadata"]["created_time"],
-                    "fetchTime": resource["metadata"]["fetch_time"],
-                    "processedTime": resource["metadata"].get("processed_time"),
-                    "identifier": {
-                        "key": resource["metadata"]["identifier"]["key"],
-                        "uid": resource["metadata"]["identifier"]["uid"],
-                        "patientId": resource["metadata"]["identifier"]["patient_id"]
-                    },
-                    "resourceType": resource["metadata"]["resource_type"],
-                    "version": resource["metadata"]["version"]
-                },
-                "humanReadableStr": resource["human_readable_str"],
-                "aiSummary": resource.get("ai_summary")
-            }
-            formatted_resources.append(formatted_resource)
+        total_count = len(matches)
+        formatted_resources = [resources[i] for i in matches[offset:offset + limit]]
         
-        return {
+        return ORJSONResponse({
             "resources": formatted_resources,
             "totalCount": total_count,
             "hasMore": (offset + limit) < total_count
-        }
+        })
         
     except Exception as e:
         logger.error(f"Error getting patient resources: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get resources: {str(e)}")
 
 @app.get("/api/resources")
-async def get_all_resources(
+def get_all_resources(
     patient_id: Optional[str] = Query(None, description="Filter by patient ID"),
     state_filter: Optional[int] = Query(None, description="Filter by processing state"),
     resource_type_filter: Optional[str] = Query(None, description="Filter by resource type"),
@@ -262,71 +581,28 @@ async def get_all_resources(
         resources = mock_storage["resources"]
         
         # Apply filters
-        if patient_id:
-            resources = [r for r in resources if r["metadata"]["identifier"]["patient_id"] == patient_id]
-        
-        if state_filter is not None:
-            resources = [r for r in resources if r["metadata"]["state"] == state_filter]
-        
-        if resource_type_filter:
-            resources = [r for r in resources if r["metadata"]["resource_type"] == resource_type_filter]
+        matches = resources.query(patient_id, state_filter, resource_type_filter)
         
         # Apply pagination
-        total_count = len(resources)
-        paginated_resources = resources[offset:offset + limit]
-        
-        # Convert to response format
-        formatted_resources = []
-        for resource in paginated_resources:
-            formatted_resource = {
-                "metadata": {
-                    "state": resource["metadata"]["state"],
-                    "createdTime": resource["metadata"]["created_time"],
-                    "fetchTime": resource["metadata"]["fetch_time"],
-                    "processedTime": resource["metadata"].get("processed_time"),
-                    "identifier": {
-                        "key": resource["metadata"]["identifier"]["key"],
-                        "uid": resource["metadata"]["identifier"]["uid"],
-                        "patientId": resource["metadata"]["identifier"]["patient_id"]
-                    },
-                    "resourceType": resource["metadata"]["resource_type"],
-                    "version": resource["metadata"]["version"]
-                },
-                "humanReadableStr": resource["human_readable_str"],
-                "aiSummary": resource.get("ai_summary")
-            }
-            formatted_resources.append(formatted_resource)
+        total_count = len(matches)
+        formatted_resources = [resources[i] for i in matches[offset:offset + limit]]
         
-        return {
+        # A page holds at most 100 resources, so it is serialized in one piece
+        return ORJSONResponse({
             "resources": formatted_resources,
             "totalCount": total_count,
             "hasMore": (offset + limit) < total_count
-        }
+        })
         
     except Exception as e:
         logger.error(f"Error getting resources: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get resources: {str(e)}")
 
 @app.get("/api/patients")
-async def get_patients():
+def get_patients(request: Request):
     """Get all patient profiles"""
     try:
-        patients = mock_storage["patients"]
-        
-        # Convert to response format
-        formatted_patients = []
-        for patient in patients:
-            formatted_patient = {
-                "id": patient["id"],
-                "name": patient.get("name"),
-                "email": patient.get("email"),
-                "consentGiven": patient["consent_given"],
-                "preferences": patient.get("preferences"),
-                "createdAt": patient["created_at"]
-            }
-            formatted_patients.append(formatted_patient)
-        
-        return {"patients": formatted_patients}
+        return patients_cache.response(request)
         
     except Exception as e:
         logger.error(f"Error getting patients: {str(e)}")
@@ -336,22 +612,11 @@ async def get_patients():
 async def get_patient(patient_id: str):
     """Get specific patient profile"""
     try:
-        patients = mock_storage["patients"]
-        patient = next((p for p in patients if p["id"] == patient_id), None)
+        formatted_patient = mock_storage["patients_by_id"].get(patient_id)
         
-        if not patient:
+        if not formatted_patient:
             raise HTTPException(status_code=404, detail=f"Patient {patient_id} not found")
         
-        # Convert to response format
-        formatted_patient = {
-            "id": patient["id"],
-            "name": patient.get("name"),
-            "email": patient.get("email"),
-            "consentGiven": patient["consent_given"],
-            "preferences": patient.get("preferences"),
-            "createdAt": patient["created_at"]
-        }
-        
         return formatted_patient
         
     except HTTPException:
@@ -364,25 +629,11 @@ async def get_patient(patient_id: str):
 async def get_derived_facts(patient_id: str):
     """Get derived clinical facts for patient"""
     try:
-        facts = mock_storage["derived_facts"]
-        patient_facts = next((f for f in facts if f["patient_id"] == patient_id), None)
+        formatted_facts = mock_storage["facts_by_patient"].get(patient_id)
         
-        if not patient_facts:
+        if not formatted_facts:
             raise HTTPException(status_code=404, detail=f"Derived facts for patient {patient_id} not found")
         
-        # Convert to response format
-        formatted_facts = {
-            "patientId": patient_facts["patient_id"],
-            "ageYears": patient_facts["age_years"],
-            "sex": patient_facts["sex"],
-            "diagnoses": patient_facts["diagnoses"],
-            "medications": patient_facts["medications"],
-            "keyLabs": patient_facts["key_labs"],
-            "exclusions": patient_facts["exclusions"],
-            "location": patient_facts["location"],
-            "extractedAt": patient_facts["extracted_at"]
-        }
-        
         return formatted_facts
         
     except HTTPException:
@@ -391,14 +642,13 @@ async def get_derived_facts(patient_id: str):
         logger.error(f"Error getting derived facts: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get derived facts: {str(e)}")
 
-@app.post("/api/process-document")
-async def process_document(request: ProcessDocumentRequest):
-    """Process a new document using Medallion architecture"""
-    try:
-        logger.info(f"Processing document for patient {request.patient_id} using Medallion pipeline")
-        
+def process_document_sync(request: ProcessDocumentRequest) -> Dict[str, Any]:
+    """Run a document through the Medallion pipeline and store the results"""
+    # Held for the whole run: document IDs, resource IDs and the gold profile
+    # replacement all depend on the current contents of storage
+    with storage_lock:
         # BRONZE LAYER: Create raw document
-        doc_id = f"doc_{request.patient_id}_{len(mock_storage['bronze_documents']) + 1}"
+        doc_id = f"doc_{request.patient_id}_{next_document_number()}"
         bronze_doc = BronzeDocument(
             document_id=doc_id,
             patient_id=request.patient_id,
@@ -411,10 +661,19 @@ async def process_document(request: ProcessDocumentRequest):
         # SILVER LAYER: Extract structured entities
         silver_entities = medallion_pipeline.bronze_to_silver_document(bronze_doc)
         mock_storage["silver_entities"].extend(silver_entities)
+        # One pass over the new entities: stats total, stored views and response summaries
+        entity_summaries = []
+        confidence_sum = 0.0
+        for entity in silver_entities:
+            confidence_sum += entity.confidence_score
+            formatted_entity = format_silver_entity(entity)
+            mock_storage["formatted_silver_entities"].append(formatted_entity)
+            mock_storage["silver_by_type"].setdefault(entity.entity_type, []).append(formatted_entity)
+            entity_summaries.append(summarize_silver_entity(entity))
+        mock_storage["silver_confidence_sum"] += confidence_sum
         
         # GOLD LAYER: Create business-ready profile (if patient exists)
-        patients = mock_storage["patients"]
-        patient = next((p for p in patients if p["id"] == request.patient_id), None)
+        patient = mock_storage["patients_by_id"].get(request.patient_id)
         
         gold_profile = None
         if patient:
@@ -428,54 +687,51 @@ async def process_document(request: ProcessDocumentRequest):
             )
             
             # Update or add gold profile
-            existing_gold = next((g for g in mock_storage["gold_profiles"] 
-                                if hasattr(g, 'patient_id') and g.patient_id == request.patient_id), None)
+            existing_gold = mock_storage["gold_profiles"].pop(request.patient_id, None)
+            mock_storage["gold_profile_fragments"].pop(request.patient_id, None)
             if existing_gold:
-                mock_storage["gold_profiles"].remove(existing_gold)
-            mock_storage["gold_profiles"].append(gold_profile)
+                mock_storage["gold_business_value_sum"] -= existing_gold._business_value
+            mock_storage["gold_profiles"][request.patient_id] = gold_profile
+            mock_storage["gold_profile_fragments"][request.patient_id] = orjson.dumps(format_gold_profile(gold_profile))
+            gold_profiles_cache.invalidate()
+            mock_storage["gold_business_value_sum"] += gold_profile._business_value
         
         # Traditional resource creation for compatibility
         ai_summary = data_generator.generate_ai_summary(request.resource_type, request.document_content)
         resource_id = len(mock_storage["resources"]) + 1
-        processed_time = datetime.now()
+        processed_at = clock.now_iso()
         
         resource_data = {
             "metadata": {
                 "state": 3,  # PROCESSING_STATE_COMPLETED
-                "created_time": processed_time.isoformat(),
-                "fetch_time": processed_time.isoformat(),
-                "processed_time": processed_time.isoformat(),
+                "createdTime": processed_at,
+                "fetchTime": processed_at,
+                "processedTime": processed_at,
                 "identifier": {
                     "key": f"res_{request.patient_id}_{resource_id:04d}",
                     "uid": f"{resource_id:04d}",
-                    "patient_id": request.patient_id
+                    "patientId": request.patient_id
                 },
-                "resource_type": request.resource_type,
+                "resourceType": request.resource_type,
                 "version": 1
             },
-            "human_readable_str": request.document_content[:500],
-            "ai_summary": ai_summary
+            "humanReadableStr": request.document_content[:500],
+            "aiSummary": ai_summary
         }
-        mock_storage["resources"].append(resource_data)
+        mock_storage["resources"].add(resource_data)
+        pipeline_stats_cache.invalidate()
         
         # Response with medallion insights
         response = {
             "success": True,
-            "message": f"Processed document through Medallion pipeline",
+            "message": "Processed document through Medallion pipeline",
             "medallion_results": {
                 "bronze_document_id": bronze_doc.document_id,
                 "silver_entities_extracted": len(silver_entities),
                 "gold_profile_updated": gold_profile is not None,
                 "business_value": gold_profile._business_value if gold_profile else 0
             },
-            "silver_entities": [
-                {
-                    "type": entity.entity_type,
-                    "value": entity.entity_value,
-                    "confidence": entity.confidence_score,
-                    "code": entity.normalized_code
-                } for entity in silver_entities
-            ]
+            "silver_entities": entity_summaries
         }
         
         if gold_profile:
@@ -488,92 +744,59 @@ async def process_document(request: ProcessDocumentRequest):
             }
         
         return response
+
+@app.post("/api/process-document")
+async def process_document(request: ProcessDocumentRequest):
+    """Process a new document using Medallion architecture"""
+    try:
+        logger.info(f"Processing document for patient {request.patient_id} using Medallion pipeline")
+        
+        # Extraction and scoring are CPU-bound; keep them off the event loop.
+        # The response holds only JSON-native values, so it skips FastAPI's encoder pass
+        return ORJSONResponse(await asyncio.to_thread(process_document_sync, request))
         
     except Exception as e:
         logger.error(f"Error processing document: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to process document: {str(e)}")
 
 @app.get("/api/medallion/pipeline-stats")
-async def get_pipeline_stats():
+def get_pipeline_stats(request: Request):
     """Get Medallion pipeline performance statistics"""
     try:
-        stats = medallion_pipeline.get_pipeline_stats()
-        storage_stats = {
-            "bronze_documents": len(mock_storage["bronze_documents"]),
-            "silver_entities": len(mock_storage["silver_entities"]),
-            "gold_profiles": len(mock_storage["gold_profiles"])
-        }
-        
-        return {
-            "pipeline_stats": stats,
-            "storage_stats": storage_stats,
-            "data_quality": {
-                "avg_entity_confidence": sum(e.confidence_score for e in mock_storage["silver_entities"]) / len(mock_storage["silver_entities"]) if mock_storage["silver_entities"] else 0,
-                "avg_business_value": sum(g._business_value for g in mock_storage["gold_profiles"]) / len(mock_storage["gold_profiles"]) if mock_storage["gold_profiles"] else 0
-            }
-        }
+        return pipeline_stats_cache.response(request)
     except Exception as e:
         logger.error(f"Error getting pipeline stats: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get pipeline stats: {str(e)}")
 
 @app.get("/api/medallion/gold-profiles")
-async def get_gold_profiles():
+def get_gold_profiles(request: Request):
     """Get all Gold layer patient profiles"""
     try:
-        profiles = []
-        for profile in mock_storage["gold_profiles"]:
-            profiles.append({
-                "patient_id": profile.patient_id,
-                "age_years": profile.age_years,
-                "sex": profile.sex,
-                "primary_conditions": profile.primary_conditions,
-                "comorbidities": profile.comorbidities,
-                "current_medications": profile.current_medications,
-                "contraindications": profile.contraindications,
-                "geographic_location": profile.geographic_location,
-                "trial_eligibility_factors": profile.trial_eligibility_factors,
-                "business_value": profile._business_value,
-                "enriched_at": profile._enriched_at
-            })
-        
-        return {"gold_profiles": profiles}
+        return gold_profiles_cache.response(request)
         
     except Exception as e:
         logger.error(f"Error getting gold profiles: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get gold profiles: {str(e)}")
 
 @app.get("/api/medallion/silver-entities")
-async def get_silver_entities(
+def get_silver_entities(
     entity_type: Optional[str] = Query(None, description="Filter by entity type"),
     patient_id: Optional[str] = Query(None, description="Filter by patient ID")
 ):
     """Get Silver layer extracted entities"""
     try:
-        entities = mock_storage["silver_entities"]
-        
         # Apply filters
         if entity_type:
-            entities = [e for e in entities if e.entity_type == entity_type]
+            entities = mock_storage["silver_by_type"].get(entity_type, [])
+        else:
+            entities = mock_storage["formatted_silver_entities"]
         
         # Note: Would need to track patient_id in entities for this filter
         # For now, this is a placeholder
         
-        formatted_entities = []
-        for entity in entities:
-            formatted_entities.append({
-                "entity_type": entity.entity_type,
-                "entity_value": entity.entity_value,
-                "confidence_score": entity.confidence_score,
-                "extracted_from": entity.extracted_from,
-                "normalized_code": entity.normalized_code,
-                "quality_score": entity._quality_score,
-                "processed_at": entity._processed_at
-            })
-        
-        return {
-            "silver_entities": formatted_entities,
-            "total_count": len(formatted_entities)
-        }
+        # These lists only grow, so a copy of the current prefix is a stable snapshot to stream
+        entities = entities[:]
+        return stream_json_list("silver_entities", entities, {"total_count": len(entities)})
         
     except Exception as e:
         logger.error(f"Error getting silver entities: {str(e)}")
@@ -581,4 +804,6 @@ async def get_silver_entities(
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
+    # "auto" picks uvloop and httptools when installed and falls back to asyncio/h11 otherwise.
+    # Single worker: mock_storage lives in process memory, so extra workers would each hold their own data
+    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, loop="auto", http="auto", reload=True)
@@ -6,16 +6,25 @@ This demonstrates production-ready data processing patterns for unstructured hea
 """
 
 from dataclasses import dataclass, field, asdict
-from typing import List, Dict, Any, Optional, Union, Callable
-from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Union, Callable, NamedTuple
+from datetime import timedelta
 from enum import Enum
 import re
 import json
+import sys
+from bisect import bisect_right
+from collections import deque
 from functools import wraps
 import logging
 
+from .clock import CoarseClock
+
 logger = logging.getLogger(__name__)
 
+# Layer timestamps for every constructed record; objects built within the same
+# millisecond share one formatted string instead of each calling datetime.now()
+_layer_clock = CoarseClock()
+
 # ===== PIPELINE STAGE DECORATORS =====
 
 def bronze_layer(cls):
@@ -25,18 +34,20 @@ def bronze_layer(cls):
     - Preserve original format
     - Add ingestion metadata
     """
-    @wraps(cls)
-    def wrapper(*args, **kwargs):
-        instance = cls(*args, **kwargs)
-        instance._layer = "bronze"
-        instance._ingested_at = datetime.now().isoformat()
+    init = cls.__init__
+    
+    @wraps(init)
+    def __init__(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        self._layer = "bronze"
+        self._ingested_at = _layer_clock.now_iso()
         logger.debug(f"Bronze layer: Ingested {cls.__name__}")
-        return instance
     
-    # Add metadata to class
-    wrapper._layer_type = "bronze"
-    wrapper._description = "Raw data ingestion layer"
-    return wrapper
+    # Stamp instances in __init__ and add metadata, keeping the class itself
+    cls.__init__ = __init__
+    cls._layer_type = "bronze"
+    cls._description = "Raw data ingestion layer"
+    return cls
 
 def silver_layer(cls):
     """
@@ -45,18 +56,21 @@ def silver_layer(cls):
     - Standardized formats
     - Basic entity extraction
     """
-    @wraps(cls)
-    def wrapper(*args, **kwargs):
-        instance = cls(*args, **kwargs)
-        instance._layer = "silver"
-        instance._processed_at = datetime.now().isoformat()
-        instance._quality_score = instance._calculate_quality_score() if hasattr(instance, '_calculate_quality_score') else 1.0
-        logger.debug(f"Silver layer: Processed {cls.__name__} (quality: {instance._quality_score})")
-        return instance
-    
-    wrapper._layer_type = "silver"
-    wrapper._description = "Cleaned and validated data layer"
-    return wrapper
+    init = cls.__init__
+    quality_score = getattr(cls, '_calculate_quality_score', None)
+    
+    @wraps(init)
+    def __init__(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        self._layer = "silver"
+        self._processed_at = _layer_clock.now_iso()
+        self._quality_score = quality_score(self) if quality_score else 1.0
+        logger.debug(f"Silver layer: Processed {cls.__name__} (quality: {self._quality_score})")
+    
+    cls.__init__ = __init__
+    cls._layer_type = "silver"
+    cls._description = "Cleaned and validated data layer"
+    return cls
 
 def gold_layer(cls):
     """
@@ -65,23 +79,26 @@ def gold_layer(cls):
     - Derived insights
     - Optimized for analytics
     """
-    @wraps(cls)
-    def wrapper(*args, **kwargs):
-        instance = cls(*args, **kwargs)
-        instance._layer = "gold"
-        instance._enriched_at = datetime.now().isoformat()
-        instance._business_value = instance._calculate_business_value() if hasattr(instance, '_calculate_business_value') else 1.0
-        logger.debug(f"Gold layer: Enriched {cls.__name__} (business value: {instance._business_value})")
-        return instance
-    
-    wrapper._layer_type = "gold"
-    wrapper._description = "Business-ready analytics layer"
-    return wrapper
+    init = cls.__init__
+    business_value = getattr(cls, '_calculate_business_value', None)
+    
+    @wraps(init)
+    def __init__(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        self._layer = "gold"
+        self._enriched_at = _layer_clock.now_iso()
+        self._business_value = business_value(self) if business_value else 1.0
+        logger.debug(f"Gold layer: Enriched {cls.__name__} (business value: {self._business_value})")
+    
+    cls.__init__ = __init__
+    cls._layer_type = "gold"
+    cls._description = "Business-ready analytics layer"
+    return cls
 
 # ===== BRONZE LAYER: RAW DATA STRUCTURES =====
 
 @bronze_layer
-@dataclass
+@dataclass(slots=True)
 class BronzeDocument:
     """Raw document as ingested from source systems"""
     document_id: str
@@ -91,25 +108,31 @@ class BronzeDocument:
     raw_content: str
     file_metadata: Dict[str, Any] = field(default_factory=dict)
     ingestion_timestamp: Optional[str] = None
+    # Set by @bronze_layer; declared so the slotted class has room for them
+    _layer: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _ingested_at: Optional[str] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         if not self.ingestion_timestamp:
-            self.ingestion_timestamp = datetime.now().isoformat()
+            self.ingestion_timestamp = _layer_clock.now_iso()
 
 @bronze_layer
-@dataclass
+@dataclass(slots=True)
 class BronzePatientRecord:
     """Raw patient data from EHR systems"""
     patient_id: str
     raw_demographics: Dict[str, Any]
     raw_clinical_data: List[Dict[str, Any]]
     source_ehr_system: str
-    extraction_timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+    extraction_timestamp: str = field(default_factory=_layer_clock.now_iso)
+    # Set by @bronze_layer
+    _layer: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _ingested_at: Optional[str] = field(default=None, init=False, repr=False, compare=False)
 
 # ===== SILVER LAYER: CLEANED DATA STRUCTURES =====
 
 @silver_layer
-@dataclass
+@dataclass(slots=True)
 class SilverClinicalEntity:
     """Extracted and validated clinical entities"""
     entity_type: str  # "medication", "diagnosis", "lab_value", etc.
@@ -118,6 +141,11 @@ class SilverClinicalEntity:
     extracted_from: str  # source text
     normalized_code: Optional[str] = None  # ICD-10, RxNorm, etc.
     temporal_info: Optional[Dict[str, Any]] = None
+    numeric_value: Optional[float] = None  # parsed lab value
+    # Set by @silver_layer
+    _layer: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _processed_at: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _quality_score: Optional[float] = field(default=None, init=False, repr=False, compare=False)
     
     def _calculate_quality_score(self) -> float:
         """Calculate data quality based on confidence and normalization"""
@@ -128,8 +156,36 @@ class SilverClinicalEntity:
             base_score += 0.1
         return min(base_score, 1.0)
 
+@dataclass(slots=True)
+class SilverEntityBatch:
+    """Silver entity values bucketed by type, plus parsed lab results, for gold aggregation"""
+    values_by_type: Dict[str, List[str]] = field(default_factory=dict)
+    lab_values: Dict[str, float] = field(default_factory=dict)  # first result per lab name
+
+    @classmethod
+    def from_entities(cls, entities: List[SilverClinicalEntity]) -> "SilverEntityBatch":
+        batch = cls()
+        buckets = batch.values_by_type
+        labs = batch.lab_values
+        for entity in entities:
+            entity_type = entity.entity_type
+            value = entity.entity_value
+            bucket = buckets.get(entity_type)
+            if bucket is None:
+                buckets[entity_type] = [value]
+            else:
+                bucket.append(value)
+            if entity_type == ENTITY_LAB_VALUE and entity.numeric_value is not None:
+                lab_name = value.partition(":")[0]
+                if lab_name not in labs:
+                    labs[lab_name] = entity.numeric_value
+        return batch
+
+    def values_of(self, entity_type: str) -> List[str]:
+        return self.values_by_type.get(entity_type) or []
+
 @silver_layer
-@dataclass
+@dataclass(slots=True)
 class SilverLabResult:
     """Structured lab result with validation"""
     test_name: str
@@ -139,6 +195,10 @@ class SilverLabResult:
     test_date: str
     abnormal_flag: Optional[str] = None
     loinc_code: Optional[str] = None
+    # Set by @silver_layer
+    _layer: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _processed_at: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _quality_score: Optional[float] = field(default=None, init=False, repr=False, compare=False)
     
     def _calculate_quality_score(self) -> float:
         """Assess lab result completeness and validity"""
@@ -150,7 +210,7 @@ class SilverLabResult:
         return score
 
 @silver_layer
-@dataclass
+@dataclass(slots=True)
 class SilverMedication:
     """Structured medication with dosage information"""
     medication_name: str
@@ -160,16 +220,19 @@ class SilverMedication:
     start_date: Optional[str] = None
     end_date: Optional[str] = None
     rxnorm_code: Optional[str] = None
+    # Set by @silver_layer
+    _layer: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _processed_at: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _quality_score: Optional[float] = field(default=None, init=False, repr=False, compare=False)
     
     def _calculate_quality_score(self) -> float:
         """Assess medication data completeness"""
-        required_fields = [self.medication_name, self.dosage, self.frequency]
-        present_required = sum(1 for field in required_fields if field)
-        optional_score = sum(0.1 for field in [self.route, self.start_date, self.rxnorm_code] if field)
-        return (present_required / len(required_fields)) * 0.7 + optional_score
+        present_required = bool(self.medication_name) + bool(self.dosage) + bool(self.frequency)
+        present_optional = bool(self.route) + bool(self.start_date) + bool(self.rxnorm_code)
+        return (present_required / 3) * 0.7 + present_optional * 0.1
 
 @silver_layer
-@dataclass
+@dataclass(slots=True)
 class SilverDiagnosis:
     """Structured diagnosis with coding"""
     diagnosis_text: str
@@ -177,6 +240,10 @@ class SilverDiagnosis:
     diagnosis_date: Optional[str]
     diagnosis_type: str = "primary"  # primary, secondary, comorbidity
     confidence_score: float = 1.0
+    # Set by @silver_layer
+    _layer: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _processed_at: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _quality_score: Optional[float] = field(default=None, init=False, repr=False, compare=False)
     
     def _calculate_quality_score(self) -> float:
         """Assess diagnosis data quality"""
@@ -188,7 +255,7 @@ class SilverDiagnosis:
 # ===== GOLD LAYER: BUSINESS-READY DATA =====
 
 @gold_layer
-@dataclass
+@dataclass(slots=True)
 class GoldPatientProfile:
     """Clinical trial matching ready patient profile"""
     patient_id: str
@@ -200,16 +267,19 @@ class GoldPatientProfile:
     contraindications: List[str]
     geographic_location: str
     trial_eligibility_factors: Dict[str, Any] = field(default_factory=dict)
+    # Set by @gold_layer
+    _layer: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _enriched_at: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _business_value: Optional[float] = field(default=None, init=False, repr=False, compare=False)
     
     def _calculate_business_value(self) -> float:
         """Calculate readiness for clinical trial matching"""
-        completeness = sum([
-            bool(self.primary_conditions),
-            bool(self.current_medications),
-            bool(self.geographic_location),
-            bool(self.age_years),
-            bool(self.sex)
-        ]) / 5
+        # bool(age_years) is the age > 0 check; an unknown age is stored as 0
+        completeness = (bool(self.primary_conditions) +
+                        bool(self.current_medications) +
+                        bool(self.geographic_location) +
+                        bool(self.age_years) +
+                        bool(self.sex)) / 5
         
         richness = min(len(self.primary_conditions) * 0.2 + 
                       len(self.comorbidities) * 0.1 + 
@@ -218,7 +288,7 @@ class GoldPatientProfile:
         return (completeness * 0.7) + (richness * 0.3)
 
 @gold_layer
-@dataclass
+@dataclass(slots=True)
 class GoldClinicalSummary:
     """Aggregated clinical insights for decision support"""
     patient_id: str
@@ -227,35 +297,128 @@ class GoldClinicalSummary:
     lab_trends: Dict[str, List[Dict[str, Any]]]
     risk_factors: List[str]
     trial_match_probability: float
-    summary_generated_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    summary_generated_at: str = field(default_factory=_layer_clock.now_iso)
+    # Set by @gold_layer
+    _layer: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _enriched_at: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _business_value: Optional[float] = field(default=None, init=False, repr=False, compare=False)
     
     def _calculate_business_value(self) -> float:
         """Calculate clinical decision support value"""
-        completeness = sum([
-            bool(self.condition_severity),
-            bool(self.medication_adherence_signals),
-            bool(self.lab_trends),
-            bool(self.risk_factors)
-        ]) / 4
+        completeness = (bool(self.condition_severity) +
+                        bool(self.medication_adherence_signals) +
+                        bool(self.lab_trends) +
+                        bool(self.risk_factors)) / 4
         
         return completeness * 0.8 + min(self.trial_match_probability, 0.2)
 
+# ===== ENTITY TYPES =====
+# Single source of the entity_type tags set by the extractors and used as
+# keys by the gold buckets and the API's silver_by_type index
+ENTITY_MEDICATION = "medication"
+ENTITY_DIAGNOSIS = "diagnosis"
+ENTITY_LAB_VALUE = "lab_value"
+ENTITY_CONTRAINDICATION = "contraindication"
+
+# ===== EXTRACTION PATTERNS =====
+# Compiled once at import; extractors run them over the lowercased document
+
+# Simplified regex-based extraction (production would use NLP models)
+MEDICATION_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r"(metformin)\s+(\d+\s*mg)?",
+    r"(lisinopril)\s+(\d+\s*mg)?",
+    r"(atorvastatin)\s+(\d+\s*mg)?",
+    r"(amlodipine)\s+(\d+\s*mg)?",
+    r"(glipizide)\s+(\d+\s*mg)?",
+    r"(losartan)\s+(\d+\s*mg)?",
+    r"(semaglutide)\s+(\d+\s*mg)?"
+))
+
+# (pattern, ICD-10 code, standard name)
+DIAGNOSIS_PATTERNS = tuple((re.compile(pattern), icd_code, standard_name) for pattern, icd_code, standard_name in (
+    (r"type\s+2\s+diabetes", "E11.9", "Type 2 Diabetes"),
+    (r"hypertension", "I10", "Essential Hypertension"),
+    (r"hyperlipidemia", "E78.5", "Hyperlipidemia"),
+    (r"chronic\s+kidney\s+disease", "N18.3", "Chronic kidney disease"),
+    (r"obesity", "E66.9", "Obesity")
+))
+
+# (pattern, lab name)
+LAB_PATTERNS = tuple((re.compile(pattern), lab_name) for pattern, lab_name in (
+    (r"a1c:?\s*(\d+\.?\d*)\s*%", "hemoglobin_a1c"),
+    (r"glucose:?\s*(\d+)\s*mg/dl", "glucose"),
+    (r"creatinine:?\s*(\d+\.?\d*)\s*mg/dl", "creatinine"),
+    (r"egfr:?\s*(\d+)", "egfr"),
+    (r"ldl:?\s*(\d+)", "ldl_cholesterol"),
+    (r"hdl:?\s*(\d+)", "hdl_cholesterol")
+))
+
+# Mock terminology lookups, keyed by the lowercased names the patterns capture
+RXNORM_CODES = {
+    "metformin": "6809",
+    "lisinopril": "29046",
+    "atorvastatin": "83367",
+    "amlodipine": "17767"
+}
+
+LOINC_CODES = {
+    "hemoglobin_a1c": "4548-4",
+    "glucose": "2345-7",
+    "creatinine": "2160-0",
+    "egfr": "33914-3"
+}
+
+# Cardiac risk level by number of risk factors present
+CARDIAC_RISK_LEVELS = ("minimal", "low", "moderate", "high")
+
+# Lab thresholds: a value's bisect_right position picks its label
+A1C_THRESHOLDS = (7.0, 8.0)
+A1C_LEVELS = ("well_controlled", "moderately_controlled", "poorly_controlled")
+
+EGFR_THRESHOLDS = (30, 60, 90)
+EGFR_LEVELS = ("severe_impairment", "moderate_impairment", "mild_impairment", "normal")
+
+def classify_a1c(value: float) -> str:
+    """Diabetes control label for an A1C percentage"""
+    return A1C_LEVELS[bisect_right(A1C_THRESHOLDS, value)]
+
+def classify_egfr(value: float) -> str:
+    """Renal function label for an eGFR value"""
+    return EGFR_LEVELS[bisect_right(EGFR_THRESHOLDS, value)]
+
 # ===== TRANSFORMATION PIPELINE =====
 
+# Most recent transformations kept in the log; older entries are dropped
+TRANSFORMATION_LOG_CAPACITY = 10_000
+
+class LogEntry(NamedTuple):
+    """One transformation log record"""
+    timestamp: str
+    stage: str
+    entity_id: str
+    metric: Any
+
 class MedallionTransformer:
     """Orchestrates Bronze → Silver → Gold transformations"""
     
-    def __init__(self):
-        self.transformation_log = []
+    def __init__(self, log_capacity: int = TRANSFORMATION_LOG_CAPACITY):
+        self.transformation_log: deque[LogEntry] = deque(maxlen=log_capacity)
+        # Per-stage stats kept up to date by _log_transformation; they cover
+        # every transformation, including entries already dropped from the log
+        self._stage_stats: Dict[str, Dict[str, Any]] = {}
+        self._total_transformations = 0
+        self._last_transformation: Optional[str] = None
     
     def bronze_to_silver_document(self, bronze_doc: BronzeDocument) -> List[SilverClinicalEntity]:
         """Transform raw document content into structured clinical entities"""
         entities = []
         
         # Simulate NLP extraction (in production, use spaCy, transformers, etc.)
-        entities.extend(self._extract_medications(bronze_doc.raw_content))
-        entities.extend(self._extract_diagnoses(bronze_doc.raw_content))
-        entities.extend(self._extract_lab_values(bronze_doc.raw_content))
+        # Patterns are lowercase, so the document is lowercased once for all extractors
+        lowered = bronze_doc.raw_content.lower()
+        entities.extend(self._extract_medications(lowered))
+        entities.extend(self._extract_diagnoses(lowered))
+        entities.extend(self._extract_lab_values(lowered))
         
         self._log_transformation("bronze_to_silver", bronze_doc.document_id, len(entities))
         return entities
@@ -265,23 +428,24 @@ class MedallionTransformer:
                               entities: List[SilverClinicalEntity],
                               demographics: Dict[str, Any]) -> GoldPatientProfile:
         """Aggregate silver entities into gold patient profile"""
+        batch = SilverEntityBatch.from_entities(entities)
         
         # Extract medications
-        medications = [e.entity_value for e in entities if e.entity_type == "medication"]
+        medications = batch.values_of(ENTITY_MEDICATION)
         
         # Extract diagnoses
-        diagnoses = [e.entity_value for e in entities if e.entity_type == "diagnosis"]
+        diagnoses = batch.values_of(ENTITY_DIAGNOSIS)
         primary_conditions = diagnoses[:3]  # Top 3 as primary
         comorbidities = diagnoses[3:]
         
         # Extract contraindications
-        contraindications = [e.entity_value for e in entities if e.entity_type == "contraindication"]
+        contraindications = batch.values_of(ENTITY_CONTRAINDICATION)
         
         # Build trial eligibility factors
         eligibility_factors = {
-            "diabetes_controlled": self._assess_diabetes_control(entities),
-            "renal_function": self._assess_renal_function(entities),
-            "cardiac_risk": self._assess_cardiac_risk(entities)
+            "diabetes_controlled": self._assess_diabetes_control(batch),
+            "renal_function": self._assess_renal_function(batch),
+            "cardiac_risk": self._assess_cardiac_risk(batch)
         }
         
         gold_profile = GoldPatientProfile(
@@ -302,52 +466,35 @@ class MedallionTransformer:
     # ===== EXTRACTION METHODS (Simulate NLP) =====
     
     def _extract_medications(self, text: str) -> List[SilverClinicalEntity]:
-        """Extract medication entities from text"""
-        # Simplified regex-based extraction (production would use NLP models)
-        med_patterns = [
-            r"(metformin)\s+(\d+\s*mg)?",
-            r"(lisinopril)\s+(\d+\s*mg)?",
-            r"(atorvastatin)\s+(\d+\s*mg)?",
-            r"(amlodipine)\s+(\d+\s*mg)?",
-            r"(glipizide)\s+(\d+\s*mg)?",
-            r"(losartan)\s+(\d+\s*mg)?",
-            r"(semaglutide)\s+(\d+\s*mg)?"
-        ]
-        
+        """Extract medication entities from lowercased text"""
         medications = []
-        for pattern in med_patterns:
-            matches = re.finditer(pattern, text.lower())
+        rxnorm_code = RXNORM_CODES.get
+        for pattern in MEDICATION_PATTERNS:
+            matches = pattern.finditer(text)
             for match in matches:
-                med_name = match.group(1)
+                # Interned so repeated mentions share one name string
+                med_name = sys.intern(match.group(1))
                 dosage = match.group(2) if len(match.groups()) > 1 else None
                 
                 entity = SilverClinicalEntity(
-                    entity_type="medication",
+                    entity_type=ENTITY_MEDICATION,
                     entity_value=f"{med_name} {dosage}".strip() if dosage else med_name,
                     confidence_score=0.9,
                     extracted_from=match.group(0),
-                    normalized_code=self._get_rxnorm_code(med_name)
+                    normalized_code=rxnorm_code(med_name)
                 )
                 medications.append(entity)
         
         return medications
     
     def _extract_diagnoses(self, text: str) -> List[SilverClinicalEntity]:
-        """Extract diagnosis entities from text"""
-        diagnosis_patterns = [
-            (r"type\s+2\s+diabetes", "E11.9", "Type 2 Diabetes"),
-            (r"hypertension", "I10", "Essential Hypertension"),
-            (r"hyperlipidemia", "E78.5", "Hyperlipidemia"),
-            (r"chronic\s+kidney\s+disease", "N18.3", "Chronic kidney disease"),
-            (r"obesity", "E66.9", "Obesity")
-        ]
-        
+        """Extract diagnosis entities from lowercased text"""
         diagnoses = []
-        for pattern, icd_code, standard_name in diagnosis_patterns:
-            matches = re.finditer(pattern, text.lower())
+        for pattern, icd_code, standard_name in DIAGNOSIS_PATTERNS:
+            matches = pattern.finditer(text)
             for match in matches:
                 entity = SilverClinicalEntity(
-                    entity_type="diagnosis",
+                    entity_type=ENTITY_DIAGNOSIS,
                     entity_value=standard_name,
                     confidence_score=0.95,
                     extracted_from=match.group(0),
@@ -358,27 +505,20 @@ class MedallionTransformer:
         return diagnoses
     
     def _extract_lab_values(self, text: str) -> List[SilverClinicalEntity]:
-        """Extract lab values from text"""
-        lab_patterns = [
-            (r"a1c:?\s*(\d+\.?\d*)\s*%", "hemoglobin_a1c"),
-            (r"glucose:?\s*(\d+)\s*mg/dl", "glucose"),
-            (r"creatinine:?\s*(\d+\.?\d*)\s*mg/dl", "creatinine"),
-            (r"egfr:?\s*(\d+)", "egfr"),
-            (r"ldl:?\s*(\d+)", "ldl_cholesterol"),
-            (r"hdl:?\s*(\d+)", "hdl_cholesterol")
-        ]
-        
+        """Extract lab values from lowercased text"""
         lab_values = []
-        for pattern, lab_name in lab_patterns:
-            matches = re.finditer(pattern, text.lower())
+        for pattern, lab_name in LAB_PATTERNS:
+            loinc_code = LOINC_CODES.get(lab_name)
+            matches = pattern.finditer(text)
             for match in matches:
                 value = match.group(1)
                 entity = SilverClinicalEntity(
-                    entity_type="lab_value",
+                    entity_type=ENTITY_LAB_VALUE,
                     entity_value=f"{lab_name}: {value}",
                     confidence_score=0.85,
                     extracted_from=match.group(0),
-                    normalized_code=self._get_loinc_code(lab_name)
+                    normalized_code=loinc_code,
+                    numeric_value=float(value)
                 )
                 lab_values.append(entity)
         
@@ -386,121 +526,59 @@ class MedallionTransformer:
     
     # ===== CLINICAL ASSESSMENT METHODS =====
     
-    def _assess_diabetes_control(self, entities: List[SilverClinicalEntity]) -> str:
+    def _assess_diabetes_control(self, batch: SilverEntityBatch) -> str:
         """Assess diabetes control based on A1C values"""
-        a1c_entities = [e for e in entities if "hemoglobin_a1c" in e.entity_value]
-        if not a1c_entities:
-            return "unknown"
-        
-        # Extract A1C value
-        try:
-            a1c_text = a1c_entities[0].entity_value
-            a1c_value = float(re.search(r"(\d+\.?\d*)", a1c_text).group(1))
-            
-            if a1c_value < 7.0:
-                return "well_controlled"
-            elif a1c_value < 8.0:
-                return "moderately_controlled"
-            else:
-                return "poorly_controlled"
-        except:
+        a1c_value = batch.lab_values.get("hemoglobin_a1c")
+        if a1c_value is None:
             return "unknown"
+        return classify_a1c(a1c_value)
     
-    def _assess_renal_function(self, entities: List[SilverClinicalEntity]) -> str:
+    def _assess_renal_function(self, batch: SilverEntityBatch) -> str:
         """Assess kidney function based on eGFR"""
-        egfr_entities = [e for e in entities if "egfr" in e.entity_value]
-        if not egfr_entities:
-            return "unknown"
-        
-        try:
-            egfr_text = egfr_entities[0].entity_value
-            egfr_value = float(re.search(r"(\d+)", egfr_text).group(1))
-            
-            if egfr_value >= 90:
-                return "normal"
-            elif egfr_value >= 60:
-                return "mild_impairment"
-            elif egfr_value >= 30:
-                return "moderate_impairment"
-            else:
-                return "severe_impairment"
-        except:
+        egfr_value = batch.lab_values.get("egfr")
+        if egfr_value is None:
             return "unknown"
+        return classify_egfr(egfr_value)
     
-    def _assess_cardiac_risk(self, entities: List[SilverClinicalEntity]) -> str:
+    def _assess_cardiac_risk(self, batch: SilverEntityBatch) -> str:
         """Assess cardiovascular risk factors"""
-        risk_factors = []
+        # One bit per risk factor: hypertension, hyperlipidemia, diabetes
+        mask = 0
+        for value in batch.values_of(ENTITY_DIAGNOSIS):
+            value = value.lower()
+            if "hypertension" in value:
+                mask |= 1
+            if "hyperlipidemia" in value:
+                mask |= 2
+            if "diabetes" in value:
+                mask |= 4
         
-        # Check for hypertension
-        if any("hypertension" in e.entity_value.lower() for e in entities if e.entity_type == "diagnosis"):
-            risk_factors.append("hypertension")
-        
-        # Check for hyperlipidemia
-        if any("hyperlipidemia" in e.entity_value.lower() for e in entities if e.entity_type == "diagnosis"):
-            risk_factors.append("hyperlipidemia")
-        
-        # Check for diabetes
-        if any("diabetes" in e.entity_value.lower() for e in entities if e.entity_type == "diagnosis"):
-            risk_factors.append("diabetes")
-        
-        if len(risk_factors) >= 3:
-            return "high"
-        elif len(risk_factors) >= 2:
-            return "moderate"
-        elif len(risk_factors) >= 1:
-            return "low"
-        else:
-            return "minimal"
+        return CARDIAC_RISK_LEVELS[mask.bit_count()]
     
     # ===== UTILITY METHODS =====
     
-    def _get_rxnorm_code(self, medication: str) -> Optional[str]:
-        """Mock RxNorm code lookup"""
-        rxnorm_codes = {
-            "metformin": "6809",
-            "lisinopril": "29046",
-            "atorvastatin": "83367",
-            "amlodipine": "17767"
-        }
-        return rxnorm_codes.get(medication.lower())
-    
-    def _get_loinc_code(self, lab_name: str) -> Optional[str]:
-        """Mock LOINC code lookup"""
-        loinc_codes = {
-            "hemoglobin_a1c": "4548-4",
-            "glucose": "2345-7",
-            "creatinine": "2160-0",
-            "egfr": "33914-3"
-        }
-        return loinc_codes.get(lab_name)
-    
     def _log_transformation(self, stage: str, entity_id: str, metric: Any):
         """Log transformation for monitoring and debugging"""
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "stage": stage,
-            "entity_id": entity_id,
-            "metric": metric
-        }
-        self.transformation_log.append(log_entry)
+        timestamp = _layer_clock.now_iso()
+        self.transformation_log.append(LogEntry(timestamp, stage, entity_id, metric))
+        self._total_transformations += 1
+        self._last_transformation = timestamp
+        stage_stats = self._stage_stats.get(stage)
+        if stage_stats is None:
+            self._stage_stats[stage] = {"count": 1, "avg_metric": 0}
+        else:
+            stage_stats["count"] += 1
         logger.info(f"Transformation: {stage} - {entity_id} - {metric}")
     
     def get_pipeline_stats(self) -> Dict[str, Any]:
         """Get pipeline performance statistics"""
-        if not self.transformation_log:
+        if not self._total_transformations:
             return {"total_transformations": 0}
         
-        stages = {}
-        for entry in self.transformation_log:
-            stage = entry["stage"]
-            if stage not in stages:
-                stages[stage] = {"count": 0, "avg_metric": 0}
-            stages[stage]["count"] += 1
-            
         return {
-            "total_transformations": len(self.transformation_log),
-            "stages": stages,
-            "last_transformation": self.transformation_log[-1]["timestamp"]
+            "total_transformations": self._total_transformations,
+            "stages": {stage: dict(stats) for stage, stats in self._stage_stats.items()},
+            "last_transformation": self._last_transformation
         }
 
 # ===== PIPELINE FACTORY =====
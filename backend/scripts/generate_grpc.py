@@ -3,9 +3,9 @@
 Script to generate gRPC Python code from proto files
 """
 
-import subprocess
 import os
 import sys
+from importlib import resources
 from pathlib import Path
 
 def generate_grpc_code():
@@ -33,28 +33,30 @@ def generate_grpc_code():
         print("No .proto files found in protos directory")
         return False
     
+    try:
+        from grpc_tools import protoc
+    except ImportError:
+        print("✗ grpc_tools not found. Install with: pip install grpcio-tools")
+        return False
+    
+    # Compile every proto in one in-process protoc call
+    cmd = [
+        "grpc_tools.protoc",
+        f"--proto_path={proto_dir}",
+        f"--proto_path={resources.files('grpc_tools') / '_proto'}",
+        f"--python_out={generated_dir}",
+        f"--grpc_python_out={generated_dir}",
+        *(str(proto_file) for proto_file in proto_files)
+    ]
+    
+    print(f"Running: {' '.join(cmd)}")
+    
+    if protoc.main(cmd) != 0:
+        print(f"✗ Error generating code for {', '.join(p.name for p in proto_files)}")
+        return False
+    
     for proto_file in proto_files:
-        cmd = [
-            sys.executable, "-m", "grpc_tools.protoc",
-            f"--proto_path={proto_dir}",
-            f"--python_out={generated_dir}",
-            f"--grpc_python_out={generated_dir}",
-            str(proto_file)
-        ]
-        
-        print(f"Running: {' '.join(cmd)}")
-        
-        try:
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-            print(f"✓ Generated code for {proto_file.name}")
-            
-        except subprocess.CalledProcessError as e:
-            print(f"✗ Error generating code for {proto_file.name}")
-            print(f"Error: {e.stderr}")
-            return False
-        except FileNotFoundError:
-            print("✗ grpc_tools not found. Install with: pip install grpcio-tools")
-            return False
+        print(f"✓ Generated code for {proto_file.name}")
     
     print("✓ gRPC code generation completed successfully")
     
@@ -5,18 +5,16 @@ Script to run both FastAPI and gRPC services
 
 import subprocess
 import sys
-import time
 import signal
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def run_fastapi():
-    """Run FastAPI server"""
+def run_fastapi() -> subprocess.Popen:
+    """Start FastAPI server"""
     backend_dir = Path(__file__).parent.parent
     
     cmd = [
@@ -24,19 +22,16 @@ def run_fastapi():
         "app.main:app",
         "--host", "0.0.0.0",
         "--port", "8000",
+        "--loop", "auto",
+        "--http", "auto",
         "--reload"
     ]
     
     logger.info("Starting FastAPI server on http://localhost:8000")
-    
-    try:
-        return subprocess.run(cmd, cwd=backend_dir)
-    except KeyboardInterrupt:
-        logger.info("FastAPI server stopped")
-        return None
+    return subprocess.Popen(cmd, cwd=backend_dir)
 
-def run_grpc_server():
-    """Run gRPC server"""
+def run_grpc_server() -> subprocess.Popen:
+    """Start gRPC server"""
     backend_dir = Path(__file__).parent.parent
     
     cmd = [
@@ -44,12 +39,7 @@ def run_grpc_server():
     ]
     
     logger.info("Starting gRPC server on localhost:50051")
-    
-    try:
-        return subprocess.run(cmd, cwd=backend_dir)
-    except KeyboardInterrupt:
-        logger.info("gRPC server stopped")
-        return None
+    return subprocess.Popen(cmd, cwd=backend_dir)
 
 def main():
     """Run both services"""
@@ -64,20 +54,20 @@ def main():
         generate_script = backend_dir / "scripts" / "generate_grpc.py"
         subprocess.run([sys.executable, str(generate_script)])
     
-    # Run services in parallel
-    with ThreadPoolExecutor(max_workers=2) as executor:
-        try:
-            # Submit both services
-            fastapi_future = executor.submit(run_fastapi)
-            grpc_future = executor.submit(run_grpc_server)
-            
-            # Wait for both to complete
-            fastapi_future.result()
-            grpc_future.result()
-            
-        except KeyboardInterrupt:
-            logger.info("Shutting down services...")
-            executor.shutdown(wait=False)
+    # Run services as child processes and forward shutdown signals to them
+    processes = [run_fastapi(), run_grpc_server()]
+    
+    def shutdown(signum, frame):
+        logger.info("Shutting down services...")
+        for process in processes:
+            if process.poll() is None:
+                process.terminate()
+    
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+    
+    for process in processes:
+        process.wait()
             
     logger.info("All services stopped")
 